@@ -2,12 +2,18 @@
 AI agents for blog post generation and editing
 """
 
+import json
 import logging
-from typing import Optional, List
-
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+from langchain_core.vectorstores import VectorStore
 from langchain_ollama import ChatOllama
-from langchain.chains import RetrievalQA
-from langchain_chroma import Chroma
+from ollama import ResponseError
 
 from models import PythonFile, AgentResponse
 from config import config
@@ -16,46 +22,15 @@ from config import config
 logger = logging.getLogger(__name__)
 
 
-class BaseAgent:
-    """Base class for AI agents"""
-    
-    def __init__(self, model_name: str = None, temperature: float = 0.7):
-        self.model_name = model_name or config.model.name
-        self.temperature = temperature
-        self.llm = ChatOllama(model=self.model_name, temperature=temperature)
-    
-    def _extract_content(self, response) -> str:
-        """Extract content from Ollama response"""
-        if isinstance(response, dict):
-            return response.get('content', str(response))
-        return str(response)
-
-
-class BlogPostGenerator(BaseAgent):
-    """Generates blog posts using Ollama and RAG context"""
-    
-    def __init__(self, model_name: str = None, temperature: float = 0.7):
-        super().__init__(model_name, temperature)
-        
-    def generate_post(self, vectorstore: Chroma, files: List[PythonFile]) -> AgentResponse:
-        """Generate initial blog post from Python files context"""
-        
-        try:
-            # Create retrieval chain
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=vectorstore.as_retriever(search_kwargs={"k": config.rag.retrieval_k})
-            )
-            
-            # Build context summary
-            file_list = "\n".join([f"- {f.relative_path}" for f in files])
-            
-            prompt = f"""You are a technical blog writer. Analyze the following Python codebase and create an engaging blog post.
+GENERATE_TEMPLATE = """You are a technical blog writer. Analyze the following Python codebase and create an engaging blog post.
 
 Files in the codebase:
 {file_list}
 
+Relevant code from the codebase:
+
+{context}
+
 Your task:
 1. Identify the main purpose and functionality of the code
 2. Highlight interesting Python use cases, patterns, and techniques used
@@ -73,30 +48,19 @@ Focus on:
 
 Generate the blog post:"""
 
-            logger.info("✍️  Generating initial blog post...")
-            response = qa_chain.invoke(prompt)
-            content = self._extract_content(response)
-            
-            return AgentResponse(
-                content=content,
-                metadata={"step": "initial_generation", "files_analyzed": len(files)}
-            )
-            
-        except Exception as e:
-            logger.error(f"Error generating blog post: {e}")
-            raise
+# Query used to retrieve the code chunks that go into {context}
+RETRIEVAL_QUERY = (
+    "What is the main purpose of this code, and which Python features, "
+    "libraries, patterns and techniques does it use?"
+)
 
+EDIT_FORMAT_INSTRUCTIONS = """Do not rewrite the post. Return only a JSON object of the form
+{"edits": [{"find": "exact text from the post", "replace": "corrected text"}]}
+- "find" must be copied exactly from the post and be long enough to be unique
+- Edits must not overlap and must be ordered by position in the post
+- Return {"edits": []} if nothing needs to change"""
 
-class GrammarEditorAgent(BaseAgent):
-    """AI agent that reviews and corrects grammar"""
-    
-    def __init__(self, model_name: str = None):
-        super().__init__(model_name, temperature=0.3)
-        
-    def edit(self, content: str) -> AgentResponse:
-        """Review and fix grammatical errors"""
-        
-        prompt = f"""You are a professional editor specializing in technical writing. 
+GRAMMAR_TEMPLATE = """You are a professional editor specializing in technical writing. 
 Review the following blog post for grammatical errors, clarity, and readability.
 
 Instructions:
@@ -107,32 +71,15 @@ Instructions:
 - Maintain the original meaning and structure
 - Do not add or remove sections
 
+{format_instructions}
+
 Blog post to edit:
 
 {content}
 
-Provide the edited version:"""
+Provide the edits as JSON:"""
 
-        logger.info("📝 Running grammar and style review...")
-        response = self.llm.invoke(prompt)
-        content = self._extract_content(response)
-        
-        return AgentResponse(
-            content=content,
-            metadata={"step": "grammar_review"}
-        )
-
-
-class TechnicalEditorAgent(BaseAgent):
-    """AI agent that reviews technical accuracy and code examples"""
-    
-    def __init__(self, model_name: str = None):
-        super().__init__(model_name, temperature=0.2)
-        
-    def edit(self, content: str) -> AgentResponse:
-        """Review technical accuracy and validate code examples"""
-        
-        prompt = f"""You are a senior Python developer and technical editor.
+TECHNICAL_TEMPLATE = """You are a senior Python developer and technical editor.
 Review this blog post for technical accuracy and code correctness.
 
 Instructions:
@@ -144,32 +91,15 @@ Instructions:
 - Fix any technical inaccuracies
 - Keep the writing style and structure intact
 
+{format_instructions}
+
 Blog post to review:
 
 {content}
 
-Provide the technically reviewed version:"""
+Provide the edits as JSON:"""
 
-        logger.info("🔍 Running technical review...")
-        response = self.llm.invoke(prompt)
-        content = self._extract_content(response)
-        
-        return AgentResponse(
-            content=content,
-            metadata={"step": "technical_review"}
-        )
-
-
-class FinalPolishAgent(BaseAgent):
-    """AI agent that creates the final concise version"""
-    
-    def __init__(self, model_name: str = None):
-        super().__init__(model_name, temperature=0.4)
-        
-    def polish(self, content: str) -> AgentResponse:
-        """Create final polished and concise version"""
-        
-        prompt = f"""You are a content strategist finalizing a technical blog post.
+POLISH_INSTRUCTIONS = """You are a content strategist finalizing a technical blog post.
 Create the final, polished version that is concise yet comprehensive.
 
 Instructions:
@@ -181,17 +111,313 @@ Instructions:
 - Aim for clarity and impact
 - Add a compelling title and brief introduction if missing
 
-Blog post to polish:
+"""
+
+POLISH_TEMPLATE = POLISH_INSTRUCTIONS + """Blog post to polish:
+
+{content}
+
+Provide the final polished version:"""
+
+MERGE_POLISH_TEMPLATE = POLISH_INSTRUCTIONS + """Two reviewed versions of the same blog post follow. The first was edited for
+grammar and style, the second was reviewed for technical accuracy. Merge them:
+keep the wording fixes from the first and the technical corrections from the second.
+
+Grammar-edited version:
 
 {content}
 
+Technically reviewed version:
+
+{technical_version}
+
 Provide the final polished version:"""
 
+
+def _format_docs(docs: List[Document]) -> str:
+    """Join retrieved chunks, labelled with their source file"""
+    return "\n\n".join(f"# {doc.metadata.get('source', '')}\n{doc.page_content}" for doc in docs)
+
+
+class TokenProgressHandler(BaseCallbackHandler):
+    """Callback handler that reports the number of generated tokens"""
+    
+    def __init__(self, on_progress: Callable[[int], None], every: int = 50):
+        self.on_progress = on_progress
+        self.every = every
+        self.tokens = 0
+        
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.tokens += 1
+        if self.tokens % self.every == 0:
+            self.on_progress(self.tokens)
+
+
+class BaseAgent:
+    """Base class for AI agents"""
+    
+    def __init__(
+        self,
+        model_name: str = None,
+        temperature: float = 0.7,
+        format: Optional[str] = None,
+        llm: Optional[ChatOllama] = None
+    ):
+        """
+        Args:
+            model_name: Model to run (defaults to config.model.name)
+            temperature: Sampling temperature for this agent
+            format: Ollama output format, e.g. "json"
+            llm: Shared ChatOllama handle; this agent's model, temperature
+                and format are bound per call instead of creating a client
+        """
+        self.temperature = temperature
+        self.format = format
+        self._shared_llm = llm
+        self._bind(model_name or config.model.name)
+        
+    def _bind(self, model_name: str) -> None:
+        """Point this agent at model_name: set self.llm and rebuild its chains"""
+        self.model_name = model_name
+        if self._shared_llm is None:
+            self.llm = ChatOllama(model=model_name, temperature=self.temperature, format=self.format)
+        else:
+            # ChatOllama takes sampling settings as Ollama "options" per call
+            overrides = {"model": model_name, "options": {"temperature": self.temperature}}
+            if self.format:
+                overrides["format"] = self.format
+            self.llm = self._shared_llm.bind(**overrides)
+        self._build_chains()
+        
+    def _build_chains(self) -> None:
+        """Build this agent's chains from self.llm; called again on every _bind"""
+        raise NotImplementedError
+        
+    def _chain(self, template: str, **partial_variables: str):
+        """Build a prompt | llm | str chain from a template, compiled once"""
+        prompt = PromptTemplate.from_template(template, partial_variables=partial_variables)
+        return prompt | self.llm | StrOutputParser()
+
+
+class BlogPostGenerator(BaseAgent):
+    """Generates blog posts using Ollama and RAG context"""
+    
+    def __init__(self, model_name: str = None, temperature: float = 0.7, llm: Optional[ChatOllama] = None):
+        super().__init__(model_name, temperature, llm=llm)
+        
+    def _build_chains(self) -> None:
+        self.chain = self._chain(GENERATE_TEMPLATE)
+        
+    async def generate_post(
+        self,
+        vectorstore: VectorStore,
+        files: List[PythonFile],
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> AgentResponse:
+        """
+        Generate initial blog post from Python files context
+        
+        Args:
+            vectorstore: Vector store to retrieve context from
+            files: List of PythonFile objects
+            on_progress: Called with the running token count while generating
+        """
+        
+        try:
+            retriever = vectorstore.as_retriever(search_kwargs={"k": config.rag.retrieval_k})
+            # Retrieved chunks fill {context}; the rest is the shared template
+            rag_chain = RunnablePassthrough.assign(
+                context=RunnableLambda(lambda _: RETRIEVAL_QUERY) | retriever | _format_docs
+            ) | self.chain
+
+            # Build context summary
+            file_list = "\n".join([f"- {f.relative_path}" for f in files])
+
+            logger.info("✍️  Generating initial blog post...")
+            callbacks = [TokenProgressHandler(on_progress)] if on_progress else []
+            content = await rag_chain.ainvoke({"file_list": file_list}, config={"callbacks": callbacks})
+            
+            return AgentResponse(
+                content=content,
+                metadata={"step": "initial_generation", "files_analyzed": len(files)}
+            )
+            
+        except Exception as e:
+            logger.error(f"Error generating blog post: {e}")
+            raise
+
+
+    async def generate_post_direct(
+        self,
+        files: List[PythonFile],
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> AgentResponse:
+        """
+        Generate initial blog post with every file inlined in the prompt
+        
+        For codebases small enough to fit in the context window; skips
+        embedding and retrieval. Each file is cut to
+        config.rag.direct_max_file_chars characters.
+        
+        Args:
+            files: List of PythonFile objects
+            on_progress: Called with the running token count while generating
+        """
+        limit = config.rag.direct_max_file_chars
+        context = "\n\n".join(
+            f"## {f.relative_path}\n```python\n{f.content[:limit]}\n```" for f in files
+        )
+        file_list = "\n".join([f"- {f.relative_path}" for f in files])
+        
+        try:
+            logger.info("✍️  Generating initial blog post from inlined files...")
+            callbacks = [TokenProgressHandler(on_progress)] if on_progress else []
+            content = await self.chain.ainvoke(
+                {"file_list": file_list, "context": context},
+                config={"callbacks": callbacks}
+            )
+            
+            return AgentResponse(
+                content=content,
+                metadata={"step": "initial_generation", "files_analyzed": len(files), "retrieval": False}
+            )
+            
+        except Exception as e:
+            logger.error(f"Error generating blog post: {e}")
+            raise
+
+
+def apply_edits(content: str, edits: List[Dict[str, str]]) -> Tuple[str, int]:
+    """
+    Apply {find, replace} edits in order, each to its first occurrence
+    
+    Returns:
+        The edited content and the number of edits applied; edits whose
+        find text is missing from the content are skipped
+    """
+    applied = 0
+    for edit in edits:
+        find = edit.get("find") if isinstance(edit, dict) else None
+        replace = edit.get("replace") if isinstance(edit, dict) else None
+        if not isinstance(find, str) or not isinstance(replace, str) or not find or find not in content:
+            continue
+        content = content.replace(find, replace, 1)
+        applied += 1
+    return content, applied
+
+
+class EditListAgent(BaseAgent):
+    """Base class for editors that return a JSON list of edits instead of the full post"""
+    
+    step = ""
+    template = ""
+    
+    def __init__(self, model_name: str = None, temperature: float = 0.7, llm: Optional[ChatOllama] = None):
+        super().__init__(model_name, temperature, format="json", llm=llm)
+        
+    def _build_chains(self) -> None:
+        self.chain = self._chain(self.template, format_instructions=EDIT_FORMAT_INSTRUCTIONS)
+        
+    async def _run_edits(self, content: str) -> AgentResponse:
+        """Ask the model for edits to content and apply them"""
+        reply = await self.chain.ainvoke({"content": content})
+        try:
+            edits = json.loads(reply).get("edits", [])
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unparseable edit list from {self.model_name}: {e}")
+            edits = []
+            
+        if not isinstance(edits, list):
+            edits = []
+        edited, applied = apply_edits(content, edits)
+        
+        return AgentResponse(
+            content=edited,
+            metadata={"step": self.step, "edits_proposed": len(edits), "edits_applied": applied}
+        )
+
+
+class GrammarEditorAgent(EditListAgent):
+    """AI agent that reviews and corrects grammar"""
+    
+    step = "grammar_review"
+    template = GRAMMAR_TEMPLATE
+    
+    def __init__(self, model_name: str = None, llm: Optional[ChatOllama] = None):
+        self.main_model = model_name or config.model.name
+        # Style fixes don't need the full model, when a smaller one is configured
+        super().__init__(config.model.editor_model or self.main_model, temperature=0.3, llm=llm)
+        
+    async def edit(self, content: str) -> AgentResponse:
+        """Review and fix grammatical errors"""
+        logger.info("📝 Running grammar and style review...")
+        try:
+            return await self._run_edits(content)
+        except ResponseError as e:
+            # Only a missing editor model is recoverable; rebind to the main
+            # model for this and every later run
+            if e.status_code != 404 or self.model_name == self.main_model:
+                raise
+            logger.warning(f"Editor model {self.model_name} unavailable ({e.error}), using {self.main_model}")
+            self._bind(self.main_model)
+            return await self._run_edits(content)
+
+
+class TechnicalEditorAgent(EditListAgent):
+    """AI agent that reviews technical accuracy and code examples"""
+    
+    step = "technical_review"
+    template = TECHNICAL_TEMPLATE
+    
+    def __init__(self, model_name: str = None, llm: Optional[ChatOllama] = None):
+        super().__init__(model_name, temperature=0.2, llm=llm)
+        
+    async def edit(self, content: str) -> AgentResponse:
+        """Review technical accuracy and validate code examples"""
+        logger.info("🔍 Running technical review...")
+        return await self._run_edits(content)
+
+
+class FinalPolishAgent(BaseAgent):
+    """AI agent that creates the final concise version"""
+    
+    def __init__(self, model_name: str = None, llm: Optional[ChatOllama] = None):
+        super().__init__(model_name, temperature=0.4, llm=llm)
+        
+    def _build_chains(self) -> None:
+        self.chain = self._chain(POLISH_TEMPLATE)
+        self.merge_chain = self._chain(MERGE_POLISH_TEMPLATE)
+        
+    def _select(self, content: str, technical_version: Optional[str] = None):
+        """Pick the chain and its inputs, merging two reviewed drafts when given"""
+        if technical_version is None:
+            return self.chain, {"content": content}
+        return self.merge_chain, {"content": content, "technical_version": technical_version}
+        
+    async def polish(self, content: str, technical_version: Optional[str] = None) -> AgentResponse:
+        """
+        Create final polished and concise version
+        
+        Args:
+            content: Blog post to polish (the grammar-edited draft)
+            technical_version: Technically reviewed draft of the same post,
+                produced in parallel; when given, the two are merged
+        """
+        chain, inputs = self._select(content, technical_version)
+
         logger.info("✨ Creating final polished version...")
-        response = self.llm.invoke(prompt)
-        content = self._extract_content(response)
+        content = await chain.ainvoke(inputs)
         
         return AgentResponse(
             content=content,
             metadata={"step": "final_polish"}
         )
+        
+    async def stream(self, content: str, technical_version: Optional[str] = None) -> AsyncIterator[str]:
+        """Like polish(), but yield the polished post chunk by chunk as it is generated"""
+        chain, inputs = self._select(content, technical_version)
+        
+        logger.info("✨ Streaming final polished version...")
+        async for chunk in chain.astream(inputs):
+            if chunk:
+                yield chunk
@@ -3,14 +3,17 @@ Configuration settings for the Blog Post Generator
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
 class ModelConfig:
     """Configuration for AI models"""
     name: str = "llama3.2"
+    editor_model: Optional[str] = None  # smaller model for grammar/style edits, e.g. "llama3.2:1b"; None uses the main model
     temperature: float = 0.7
+    base_url: str = "http://localhost:11434"
+    timeout: float = 120.0
     available_models: List[str] = None
     
     def __post_init__(self):
@@ -24,9 +27,31 @@ class ModelConfig:
 @dataclass
 class RAGConfig:
     """Configuration for RAG (Retrieval Augmented Generation)"""
+    chunker: str = "recursive"  # "recursive", "scan" or "fast" (requires chonkie)
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    chunk_workers: Optional[int] = None  # None uses os.cpu_count()
+    parallel_chunk_min_files: int = 200
     retrieval_k: int = 5
+    direct_context_chars: int = 40000  # smaller codebases skip RAG and are inlined whole
+    direct_max_file_chars: int = 8000
+    backend: str = "auto"  # "auto", "chroma" or "faiss" (requires faiss-cpu)
+    faiss_ivf_min_train: int = 10000
+    faiss_nlist: int = 1024
+    faiss_pq_m: int = 16
+    faiss_nprobe: int = 16
+    faiss_int8: bool = False  # int8 scalar quantization for indexes below faiss_ivf_min_train
+    collection_name: str = "rag"
+    persist_dir: Optional[str] = None
+    index_cache_dir: Optional[str] = ".blog_cache"  # FAISS indexes by codebase fingerprint; None disables
+    insert_batch_size: int = 2048
+    embedding_cache_dir: str = "~/.cache/rag_builder"
+    embedding_cache_dtype: str = "float16"
+    embed_batch_size: int = 64
+    embed_concurrency: int = 4
+    local_embed: bool = True  # requires sentence-transformers; False embeds with the Ollama model
+    local_embed_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    local_embed_devices: Optional[List[str]] = None  # e.g. ["cuda:0", "cuda:1"]
     separators: List[str] = None
     
     def __post_init__(self):
@@ -40,6 +65,7 @@ class AppConfig:
     model: ModelConfig = None
     rag: RAGConfig = None
     default_output_file: str = "generated_blog_post.md"
+    llm_cache_path: str = ".blog_llm_cache.db"
     window_title: str = "Blog Post Generator"
     window_size: str = "800x700"
     viewer_size: str = "1000x800"
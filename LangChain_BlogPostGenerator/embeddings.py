@@ -0,0 +1,207 @@
+"""
+Embedding helpers for the RAG context builder
+"""
+
+import asyncio
+import atexit
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale vectors to unit L2 length so inner product equals cosine similarity"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / (norms + 1e-12)
+
+
+class ConcurrentOllamaEmbeddings(Embeddings):
+    """Ollama embeddings that send batched requests concurrently"""
+
+    def __init__(
+        self,
+        model_name: str,
+        base_url: str,
+        batch_size: int = 64,
+        concurrency: int = 4,
+        timeout: float = 120.0
+    ):
+        self.model_name = model_name
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    async def _embed_all(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batches with at most `concurrency` requests in flight"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency)
+
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+
+            async def embed_batch(batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    response = await client.post(
+                        f"{self.base_url}/api/embed",
+                        json={"model": self.model_name, "input": batch}
+                    )
+                    response.raise_for_status()
+                    return response.json()["embeddings"]
+
+            batches = [
+                texts[i:i + self.batch_size]
+                for i in range(0, len(texts), self.batch_size)
+            ]
+            results = await asyncio.gather(*(embed_batch(b) for b in batches))
+
+        return [vector for batch in results for vector in batch]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return asyncio.run(self._embed_all(texts))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return await self._embed_all(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    Local sentence-transformers embeddings
+    
+    With more than one target device, a multi-process encoding pool is
+    started once and reused for every call, so the per-batch cost is just
+    the encode itself.
+    """
+
+    def __init__(self, model_name: str, devices: Optional[List[str]] = None, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name)
+        self._pool = None
+
+        if devices and len(devices) > 1:
+            self._pool = self.model.start_multi_process_pool(target_devices=devices)
+            atexit.register(self.close)
+            logger.info(f"Started embedding pool on {', '.join(devices)}")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        if self._pool is not None:
+            vectors = self.model.encode_multi_process(
+                texts, self._pool, batch_size=self.batch_size, normalize_embeddings=True
+            )
+        else:
+            vectors = self.model.encode(
+                texts, batch_size=self.batch_size, convert_to_numpy=True, normalize_embeddings=True
+            )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True).tolist()
+
+    def close(self) -> None:
+        """Stop the multi-process pool, if one was started"""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an Embeddings instance with a persistent SQLite vector cache"""
+
+    def __init__(self, inner: Embeddings, model_name: str, cache_dir: str, dtype: str = "float16"):
+        self.inner = inner
+        self.model_name = model_name
+        # float16 halves the cache size on disk; vectors are widened back to
+        # float32 on read, which is all Chroma stores anyway
+        self.dtype = np.dtype(dtype)
+
+        cache_path = Path(cache_dir).expanduser()
+        cache_path.mkdir(parents=True, exist_ok=True)
+        safe_name = model_name.replace('/', '_').replace(':', '_')
+        db_file = cache_path / f"{safe_name}.{self.dtype.name}.db"
+
+        # The pipeline runs off the GUI thread, so allow cross-thread use
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        """Cache key for a text under the current model"""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into a unit-normalized float32 (len(texts), dim) array
+        
+        Only cache misses are sent to the wrapped model. Returning an array
+        lets callers hand vectors to the store without building a Python
+        float object per component.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        keys = [self._key(t) for t in texts]
+        hits = {}
+
+        with self._lock:
+            # Stay well below SQLite's host parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM emb WHERE hash IN ({placeholders})", batch
+                )
+                for key, vec in rows:
+                    hits[key] = np.frombuffer(vec, dtype=self.dtype)
+
+        misses = [i for i, key in enumerate(keys) if key not in hits]
+        logger.info(f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} misses")
+
+        if misses:
+            vectors = self.inner.embed_documents([texts[i] for i in misses])
+            rows = []
+            for i, vector in zip(misses, vectors):
+                stored = np.asarray(vector, dtype=self.dtype)
+                # Return exactly what a later cache hit would return
+                hits[keys[i]] = stored
+                rows.append((keys[i], stored.tobytes()))
+
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO emb (hash, vec) VALUES (?, ?)", rows)
+
+        return normalize(np.stack([hits[key] for key in keys]).astype(np.float32))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, only calling the wrapped model for cache misses"""
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Queries are embedded directly and never cached"""
+        vector = np.asarray(self.inner.embed_query(text), dtype=np.float32)
+        return normalize(vector).tolist()
@@ -11,6 +11,7 @@ from typing import Optional
 import customtkinter as ctk
 from tkinter import filedialog
 import pyperclip
+from langchain_core.globals import get_llm_cache
 
 from pipeline import BlogPostPipeline
 from models import GenerationResult
@@ -98,6 +99,14 @@ class BlogPostViewerWindow:
         )
         self.status_label.pack(pady=5)
         
+    def append(self, text: str):
+        """Append streamed text to the (read-only) content box"""
+        self.blog_content += text
+        self.content_text.configure(state="normal")
+        self.content_text.insert("end", text)
+        self.content_text.see("end")
+        self.content_text.configure(state="disabled")
+        
     def copy_to_clipboard(self):
         """Copy blog post content to clipboard"""
         try:
@@ -137,6 +146,10 @@ class BlogGeneratorGUI:
         # Initialize pipeline (will be created when needed)
         self.pipeline: Optional[BlogPostPipeline] = None
         
+        # Viewer that receives the final post while it is streamed
+        self.viewer: Optional[BlogPostViewerWindow] = None
+        self.streamed = False
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -195,13 +208,13 @@ class BlogGeneratorGUI:
         )
         self.dir_display.pack(anchor="w", padx=10, pady=(0, 10))
         
-        browse_btn = ctk.CTkButton(
+        self.browse_btn = ctk.CTkButton(
             dir_frame,
             text="📂 Browse Directory",
             command=self.browse_directory,
             height=35
         )
-        browse_btn.pack(pady=(0, 10), padx=10)
+        self.browse_btn.pack(pady=(0, 10), padx=10)
         
     def _setup_configuration_section(self, parent):
         """Setup configuration section"""
@@ -241,6 +254,14 @@ class BlogGeneratorGUI:
         self.output_entry.insert(0, config.default_output_file)
         self.output_entry.pack(side="left", padx=5, fill="x", expand=True, pady=10)
         
+        clear_cache_btn = ctk.CTkButton(
+            config_frame,
+            text="🗑 Clear LLM Cache",
+            command=self.clear_llm_cache,
+            height=30
+        )
+        clear_cache_btn.pack(anchor="e", padx=10, pady=(0, 10))
+        
     def _setup_generate_button(self, parent):
         """Setup generate button"""
         self.generate_btn = ctk.CTkButton(
@@ -276,20 +297,21 @@ class BlogGeneratorGUI:
         
     def browse_directory(self):
         """Open file dialog to select directory"""
+        # Disabling the button means a second click can't open another dialog
+        self.browse_btn.configure(state="disabled")
+        # Return from the click handler first so the button redraws before
+        # the dialog's own event loop takes over
+        self.root.after(0, self._open_directory_dialog)
+        
+    def _open_directory_dialog(self):
+        """Show the directory dialog (Tk dialogs must run on the main thread)"""
         try:
-            # Create a temporary Toplevel window for the file dialog
-            dialog_window = ctk.CTkToplevel(self.root)
-            dialog_window.withdraw()  # Hide the window
-            
             directory = filedialog.askdirectory(
-                parent=dialog_window,
+                parent=self.root,
                 title="Select Python Project Directory",
                 initialdir=os.path.expanduser("~")
             )
             
-            # Destroy the dialog window immediately after selection
-            dialog_window.destroy()
-            
             if directory:
                 self.directory_path = directory
                 self.dir_display.configure(
@@ -302,6 +324,21 @@ class BlogGeneratorGUI:
             logger.error(f"Error browsing directory: {e}")
             self.update_status(f"❌ Error selecting directory: {str(e)}", "red")
             
+        finally:
+            self.browse_btn.configure(state="normal")
+            
+    def clear_llm_cache(self):
+        """Drop all cached LLM responses so the next run calls the model again"""
+        try:
+            cache = get_llm_cache()
+            if cache is not None:
+                cache.clear()
+            self.log_progress("LLM cache cleared")
+            self.update_status("🗑 LLM cache cleared", "gray")
+        except Exception as e:
+            logger.error(f"Error clearing LLM cache: {e}")
+            self.update_status(f"❌ Error clearing cache: {str(e)}", "red")
+            
     def on_model_change(self, choice):
         """Handle model selection change"""
         self.model_name = choice
@@ -338,6 +375,8 @@ class BlogGeneratorGUI:
         
         # Clear progress
         self.progress_text.delete("1.0", "end")
+        self.viewer = None
+        self.streamed = False
         
         # Run generation in separate thread to prevent UI freezing
         thread = threading.Thread(target=self.run_generation)
@@ -354,7 +393,8 @@ class BlogGeneratorGUI:
             result = self.pipeline.generate(
                 directory=self.directory_path,
                 output_file=self.output_file,
-                progress_callback=self.log_progress
+                progress_callback=self.log_progress,
+                stream_callback=self.on_stream_chunk
             )
             
             # Update UI based on result
@@ -368,8 +408,9 @@ class BlogGeneratorGUI:
                     f"\n{'='*70}\n✅ SUCCESS!\n{'='*70}"
                 ))
                 
-                # Open viewer window with the blog post
-                if result.content:
+                # Open viewer window with the blog post, unless it was
+                # already opened while the post was streaming
+                if result.content and not self.streamed:
                     self.root.after(0, lambda: self.show_blog_post(result.content))
             else:
                 error_msg = result.error or "Unknown error occurred"
@@ -397,7 +438,18 @@ class BlogGeneratorGUI:
     
     def show_blog_post(self, blog_content: str):
         """Display the blog post in a new window"""
-        BlogPostViewerWindow(blog_content)
+        self.viewer = BlogPostViewerWindow(blog_content)
+        
+    def on_stream_chunk(self, chunk: str):
+        """Receive a streamed chunk on the worker thread and hand it to the UI"""
+        self.streamed = True
+        self.root.after(0, lambda: self.append_to_viewer(chunk))
+        
+    def append_to_viewer(self, text: str):
+        """Append a streamed chunk, opening the viewer on the first one"""
+        if self.viewer is None:
+            self.show_blog_post("")
+        self.viewer.append(text)
             
     def run(self):
         """Start the GUI"""
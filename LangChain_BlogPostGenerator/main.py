@@ -9,6 +9,9 @@ import logging
 import sys
 from pathlib import Path
 
+from langchain_community.cache import SQLiteCache
+from langchain_core.globals import set_llm_cache
+
 from gui import BlogGeneratorGUI
 from config import config
 
@@ -25,11 +28,17 @@ def setup_logging():
     )
 
 
+def setup_llm_cache():
+    """Cache LLM responses on disk so identical prompts skip the model"""
+    set_llm_cache(SQLiteCache(database_path=config.llm_cache_path))
+
+
 def main():
     """Main entry point with GUI"""
     try:
         # Setup logging
         setup_logging()
+        setup_llm_cache()
         
         # Create and run the GUI application
         app = BlogGeneratorGUI()
@@ -2,10 +2,13 @@
 Main pipeline for blog post generation
 """
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional, Callable
 
+from langchain_ollama import ChatOllama
+
 from models import PythonFile, GenerationResult
 from file_collector import PythonFileCollector
 from rag_builder import RAGContextBuilder
@@ -22,17 +25,27 @@ class BlogPostPipeline:
     def __init__(self, model_name: str = None):
         self.model_name = model_name or config.model.name
         self.collector = None
-        self.rag_builder = RAGContextBuilder(model_name)
-        self.generator = BlogPostGenerator(model_name)
-        self.grammar_editor = GrammarEditorAgent(model_name)
-        self.technical_editor = TechnicalEditorAgent(model_name)
-        self.polisher = FinalPolishAgent(model_name)
+        self._rag_builder = None
+        # One client for every agent; each binds its own model and temperature
+        self._shared_llm = ChatOllama(model=self.model_name)
+        self.generator = BlogPostGenerator(model_name, llm=self._shared_llm)
+        self.grammar_editor = GrammarEditorAgent(model_name, llm=self._shared_llm)
+        self.technical_editor = TechnicalEditorAgent(model_name, llm=self._shared_llm)
+        self.polisher = FinalPolishAgent(model_name, llm=self._shared_llm)
+        
+    @property
+    def rag_builder(self) -> RAGContextBuilder:
+        """Created on first use, so building a pipeline loads no embedding model"""
+        if self._rag_builder is None:
+            self._rag_builder = RAGContextBuilder(self.model_name)
+        return self._rag_builder
         
     def generate(
         self, 
         directory: str, 
         output_file: str = None, 
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[str], None]] = None,
+        stream_callback: Optional[Callable[[str], None]] = None
     ) -> GenerationResult:
         """
         Run the complete pipeline
@@ -41,10 +54,24 @@ class BlogPostPipeline:
             directory: Path to Python project directory
             output_file: Output file path (optional)
             progress_callback: Function to call with progress updates
+            stream_callback: Function to call with each chunk of the final
+                post as it is generated (optional)
             
         Returns:
             GenerationResult with success status and content
         """
+        return asyncio.run(
+            self.agenerate(directory, output_file, progress_callback, stream_callback)
+        )
+    
+    async def agenerate(
+        self, 
+        directory: str, 
+        output_file: str = None, 
+        progress_callback: Optional[Callable[[str], None]] = None,
+        stream_callback: Optional[Callable[[str], None]] = None
+    ) -> GenerationResult:
+        """Async version of generate(); see generate() for arguments"""
         output_file = output_file or config.default_output_file
         result = GenerationResult(success=False)
         
@@ -74,34 +101,64 @@ class BlogPostPipeline:
             result.files_processed = stats['total_files']
             result.steps_completed.append("file_collection")
             
-            # Step 2: Build RAG context
-            log("\n🔧 Step 2: Building RAG context")
-            vectorstore = self.rag_builder.build_vectorstore(files)
-            result.steps_completed.append("rag_build")
+            def on_tokens(tokens: int):
+                log(f"   Generated {tokens} tokens...")
             
-            # Step 3: Generate initial post
-            log("\n📖 Step 3: Generating blog post")
-            initial_response = self.generator.generate_post(vectorstore, files)
+            if stats['total_size'] <= config.rag.direct_context_chars:
+                # Small codebases fit in the prompt whole, so there is
+                # nothing for retrieval to choose and no need to embed
+                log("\n🔧 Step 2: Codebase fits in the prompt, skipping RAG indexing")
+                log("\n📖 Step 3: Generating blog post")
+                initial_response = await self.generator.generate_post_direct(files, on_progress=on_tokens)
+            else:
+                # Step 2: Build RAG context
+                log("\n🔧 Step 2: Building RAG context")
+                # Embedding runs its own event loop, so keep it off this one
+                vectorstore = await asyncio.to_thread(
+                    self.rag_builder.build_vectorstore,
+                    files,
+                    on_progress=lambda done, total: log(f"   Embedded {done}/{total} changed files")
+                )
+                result.steps_completed.append("rag_build")
+                
+                # Step 3: Generate initial post
+                log("\n📖 Step 3: Generating blog post")
+                initial_response = await self.generator.generate_post(vectorstore, files, on_progress=on_tokens)
             result.steps_completed.append("initial_generation")
             
-            # Step 4: Grammar review
+            # Steps 4 and 5 are independent reviews of the same draft, so run
+            # them concurrently (set OLLAMA_NUM_PARALLEL>=2 on the server)
             log("\n📋 Step 4: Grammar and style editing")
-            grammar_response = self.grammar_editor.edit(initial_response.content)
-            result.steps_completed.append("grammar_review")
-            
-            # Step 5: Technical review
             log("\n🔬 Step 5: Technical review")
-            tech_response = self.technical_editor.edit(grammar_response.content)
+            grammar_response, tech_response = await asyncio.gather(
+                self.grammar_editor.edit(initial_response.content),
+                self.technical_editor.edit(initial_response.content)
+            )
+            result.steps_completed.append("grammar_review")
             result.steps_completed.append("technical_review")
             
-            # Step 6: Final polish
+            # Step 6: Final polish, merging both reviews
             log("\n💎 Step 6: Final polish")
-            final_response = self.polisher.polish(tech_response.content)
+            if stream_callback:
+                chunks = []
+                async for chunk in self.polisher.stream(
+                    grammar_response.content,
+                    technical_version=tech_response.content
+                ):
+                    chunks.append(chunk)
+                    stream_callback(chunk)
+                final_content = "".join(chunks)
+            else:
+                final_response = await self.polisher.polish(
+                    grammar_response.content,
+                    technical_version=tech_response.content
+                )
+                final_content = final_response.content
             result.steps_completed.append("final_polish")
             
             # Save output
             log(f"\n💾 Saving to {output_file}")
-            self._save_output(final_response.content, output_file)
+            self._save_output(final_content, output_file)
             
             log("\n" + "=" * 70)
             log("✅ BLOG POST GENERATION COMPLETE!")
@@ -109,7 +166,7 @@ class BlogPostPipeline:
             log(f"\n📄 Output saved to: {output_file}")
             
             result.success = True
-            result.content = final_response.content
+            result.content = final_content
             
             return result
             
@@ -2,69 +2,588 @@
 RAG (Retrieval Augmented Generation) context builder
 """
 
-from typing import List
+import hashlib
+import json
+import os
+import shutil
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import logging
 
-from langchain_ollama import OllamaEmbeddings
+import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_chroma import Chroma
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+try:
+    from chonkie import FastChunker
+except ImportError:
+    FastChunker = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
 
 from models import PythonFile
+from embeddings import CachedEmbeddings, ConcurrentOllamaEmbeddings, SentenceTransformerEmbeddings
 from config import config
 
 
 logger = logging.getLogger(__name__)
 
 
+class SinglePassTextSplitter(RecursiveCharacterTextSplitter):
+    """
+    RecursiveCharacterTextSplitter that works on offsets instead of substrings
+    
+    Chunks are identical to the recursive splitter's (separators kept at the
+    start of the text that follows them). Each separator's occurrences are
+    found once, the first time a span needs them; recursion and merging
+    then work on (start, end) spans, so only the finished chunks are sliced
+    out of the text rather than every piece at every level being
+    re-searched, re-split and joined.
+    """
+    
+    def __init__(self, chunk_size: int, chunk_overlap: int, separators: List[str]):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=separators)
+        self._scan_separators = list(separators)
+        
+    def split_text(self, text: str) -> List[str]:
+        chunks = []
+        self._split_span(text, 0, len(text), 0, {}, chunks)
+        return chunks
+        
+    @staticmethod
+    def _occurrences(text: str, sep: str, cache: Dict[str, List[int]]) -> List[int]:
+        """Every (possibly overlapping) start of sep in text, found on first use"""
+        found = cache.get(sep)
+        if found is None:
+            found, i = [], text.find(sep)
+            while i != -1:
+                found.append(i)
+                i = text.find(sep, i + 1)
+            cache[sep] = found
+        return found
+        
+    def _split_span(self, text: str, start: int, end: int, level: int, occurrences: Dict[str, List[int]], chunks: List[str]):
+        """Split text[start:end] on the first separator from level on that occurs in it"""
+        separators = self._scan_separators
+        cuts = None
+        for i in range(level, len(separators)):
+            sep = separators[i]
+            if not sep:
+                break
+            found = self._occurrences(text, sep, occurrences)
+            lo, hi = bisect_left(found, start), bisect_right(found, end - len(sep))
+            if lo < hi:
+                # Leftmost non-overlapping matches, as re.split takes them
+                cuts, last = [], start
+                for pos in found[lo:hi]:
+                    if pos >= last:
+                        cuts.append(pos)
+                        last = pos + len(sep)
+                level = i + 1
+                break
+                
+        if cuts is None:
+            # Only a "" separator splits into characters; otherwise the
+            # span has no separator left and is kept whole
+            bounds = range(start, end + 1) if "" in separators[level:] else [start, end]
+            level = len(separators)
+        else:
+            bounds = [start, *cuts, end]
+            
+        run = []
+        for s, e in zip(bounds, bounds[1:]):
+            if e == s:
+                continue
+            if e - s < self._chunk_size:
+                run.append((s, e))
+                continue
+            if run:
+                self._merge_spans(text, run, chunks)
+                run = []
+            if level >= len(separators):
+                chunks.append(text[s:e])
+            else:
+                self._split_span(text, s, e, level, occurrences, chunks)
+        if run:
+            self._merge_spans(text, run, chunks)
+            
+    def _merge_spans(self, text: str, spans: List[Tuple[int, int]], chunks: List[str]):
+        """Merge contiguous spans into chunks, carrying up to chunk_overlap into the next"""
+        first = 0
+        for i, (s, e) in enumerate(spans):
+            if first < i and e - spans[first][0] > self._chunk_size:
+                doc = text[spans[first][0]:s].strip()
+                if doc:
+                    chunks.append(doc)
+                # Drop leading spans until what's left fits as overlap
+                while first < i and (s - spans[first][0] > self._chunk_overlap or e - spans[first][0] > self._chunk_size):
+                    first += 1
+        doc = text[spans[first][0]:spans[-1][1]].strip()
+        if doc:
+            chunks.append(doc)
+
+
+@lru_cache(maxsize=4)
+def _get_splitter(chunker: str, chunk_size: int, chunk_overlap: int, separators: Tuple[str, ...]):
+    """
+    Return a text splitter for the given settings
+    
+    Splitters are stateless across split calls, so one instance per settings
+    tuple is shared by every builder (and reused by each pool worker).
+    """
+    if chunker == "fast":
+        if FastChunker is not None:
+            # SIMD delimiter scan; chunk_size is in bytes, not characters
+            return FastChunker(chunk_size=chunk_size, delimiters="\n")
+        logger.warning("chonkie is not installed, falling back to the recursive splitter")
+        
+    if chunker == "scan":
+        return SinglePassTextSplitter(chunk_size, chunk_overlap, list(separators))
+        
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=list(separators)
+    )
+
+
+def _split_with(splitter, text: str) -> List[str]:
+    """Split text into chunks with either splitter type"""
+    if isinstance(splitter, RecursiveCharacterTextSplitter):
+        return splitter.split_text(text)
+    return [chunk.text for chunk in splitter(text)]
+
+
+def _chunk_file(args: Tuple[str, Tuple]) -> List[str]:
+    """Process pool worker: split one file's content into chunks"""
+    content, splitter_settings = args
+    return _split_with(_get_splitter(*splitter_settings), content)
+
+
+def _load_manifest(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the {relative_path: {"hash", "chunk_ids"}} manifest, if any"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest {path}: {e}")
+        return {}
+
+
+def _save_manifest(path: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    """Write the manifest atomically (write to a temp file, then rename)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=8)
+def _context_summary(file_info: Tuple[Tuple[str, int], ...]) -> str:
+    """Build the codebase summary in a single pass over (path, lines) pairs"""
+    total_lines = 0
+    parts = []
+    for relative_path, lines in file_info:
+        total_lines += lines
+        parts.append(f"- {relative_path} ({lines} lines)")
+        
+    file_list = "\n".join(parts)
+    average = total_lines / len(file_info) if file_info else 0.0
+    
+    return f"""Files in the codebase:
+{file_list}
+
+Total files: {len(file_info)}
+Total lines: {total_lines}
+Average lines per file: {average:.1f}"""
+
+
 class RAGContextBuilder:
-    """Builds RAG context from Python files using LangChain and Chroma"""
+    """Builds RAG context from Python files using LangChain and FAISS or Chroma"""
     
     def __init__(self, model_name: str = None):
         self.model_name = model_name or config.model.name
-        self.embeddings = OllamaEmbeddings(model=self.model_name)
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=config.rag.chunk_size,
-            chunk_overlap=config.rag.chunk_overlap,
-            separators=config.rag.separators
+        base_embeddings, embedding_model = self._create_base_embeddings()
+        self.embeddings = CachedEmbeddings(
+            base_embeddings,
+            model_name=embedding_model,
+            cache_dir=config.rag.embedding_cache_dir,
+            dtype=config.rag.embedding_cache_dtype
         )
+        self.splitter_settings = (
+            config.rag.chunker,
+            config.rag.chunk_size,
+            config.rag.chunk_overlap,
+            tuple(config.rag.separators)
+        )
+        self.text_splitter = _get_splitter(*self.splitter_settings)
+        self.backend = self._resolve_backend()
+        
+    def _resolve_backend(self) -> str:
+        """
+        Pick the vector store backend
         
-    def build_vectorstore(self, files: List[PythonFile]) -> Chroma:
+        "auto" uses an exact in-memory FAISS index for the usual throwaway
+        single-run store, and Chroma only when the store is persisted.
+        """
+        backend = config.rag.backend
+        if backend == "auto":
+            backend = "chroma" if config.rag.persist_dir else "faiss"
+        if backend == "faiss" and faiss is None:
+            logger.warning("faiss is not installed, falling back to Chroma")
+            backend = "chroma"
+        return backend
+        
+    def _create_base_embeddings(self) -> Tuple[Embeddings, str]:
+        """Return the uncached embeddings and the model name they embed with"""
+        if config.rag.local_embed:
+            try:
+                embeddings = SentenceTransformerEmbeddings(
+                    config.rag.local_embed_model,
+                    devices=config.rag.local_embed_devices,
+                    batch_size=config.rag.embed_batch_size
+                )
+                return embeddings, config.rag.local_embed_model
+            except ImportError:
+                logger.warning("sentence-transformers is not installed, falling back to Ollama embeddings")
+                
+        embeddings = ConcurrentOllamaEmbeddings(
+            model_name=self.model_name,
+            base_url=config.model.base_url,
+            batch_size=config.rag.embed_batch_size,
+            concurrency=config.rag.embed_concurrency,
+            timeout=config.model.timeout
+        )
+        return embeddings, self.model_name
+        
+    def _split_files(self, files: List[PythonFile]) -> Iterator[List[str]]:
+        """Yield the chunks of each file, in order"""
+        if len(files) < config.rag.parallel_chunk_min_files:
+            for file in files:
+                yield _split_with(self.text_splitter, file.content)
+            return
+            
+        # Large repos: spread the CPU-bound splitting across processes
+        with ProcessPoolExecutor(max_workers=config.rag.chunk_workers) as executor:
+            yield from executor.map(
+                _chunk_file,
+                [(file.content, self.splitter_settings) for file in files],
+                chunksize=8
+            )
+        
+    def _iter_chunks(
+        self,
+        files: List[PythonFile],
+        file_hashes: Dict[str, str]
+    ) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+        """Yield (file_number, chunk_id, chunk, metadata) for every chunk of every file"""
+        for file_number, (file, chunks) in enumerate(zip(files, self._split_files(files)), start=1):
+            # One metadata dict per file, shared by all of its chunks; both
+            # vector stores copy it on insert so the sharing is never observable
+            metadata = {
+                "source": file.relative_path,
+                "full_path": file.path,
+                "file_size": file.size,
+                "file_lines": file.lines
+            }
+            id_prefix = f"{file.relative_path}:{file_hashes[file.relative_path][:16]}"
+            for i, chunk in enumerate(chunks):
+                yield file_number, f"{id_prefix}:{i}", chunk, metadata
+                
+    def _embed_batch(self, documents: List[str]) -> np.ndarray:
+        """Embed one batch of chunks into a (len(documents), dim) float32 array"""
+        # Identical chunks (license headers, import blocks) are only embedded
+        # once; repeats across batches are served by the embedding cache
+        unique_index = {text: i for i, text in enumerate(dict.fromkeys(documents))}
+        vectors = self.embeddings.embed_array(list(unique_index))
+        # Contiguous float32 array; the stores accept it without a .tolist()
+        return vectors[[unique_index[doc] for doc in documents]]
+        
+    def _add_batch(
+        self,
+        vectorstore: Optional[VectorStore],
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        untrained: Optional[List[Tuple[List[str], List[str], List[Dict[str, Any]], np.ndarray]]] = None
+    ) -> Optional[VectorStore]:
+        """
+        Add one embedded batch of chunks to the vector store
+        
+        The FAISS store doesn't exist until its index type is decided.
+        Batches are held in `untrained` until it holds
+        config.rag.faiss_ivf_min_train vectors to train IVF-PQ on, then the
+        store is created and returned to the caller (None until then;
+        _flush_untrained() creates it from a smaller corpus at the end).
+        """
+        if self.backend == "faiss":
+            if vectorstore is None:
+                untrained.append((ids, documents, metadatas, embeddings))
+                if sum(len(batch[1]) for batch in untrained) < config.rag.faiss_ivf_min_train:
+                    return None
+                return self._flush_untrained(untrained)
+            vectorstore.add_embeddings(
+                text_embeddings=list(zip(documents, embeddings)),
+                metadatas=metadatas,
+                ids=ids
+            )
+            return vectorstore
+        
+        # Upsert so a run interrupted after inserting can be safely repeated
+        vectorstore._collection.upsert(
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas
+        )
+        return vectorstore
+        
+    def _flush_untrained(
+        self,
+        untrained: List[Tuple[List[str], List[str], List[Dict[str, Any]], np.ndarray]]
+    ) -> FAISS:
+        """Create the FAISS store from the held-back batches, then add them"""
+        vectorstore = self._create_faiss_store(np.concatenate([batch[3] for batch in untrained]))
+        for ids, documents, metadatas, embeddings in untrained:
+            vectorstore.add_embeddings(
+                text_embeddings=list(zip(documents, embeddings)),
+                metadatas=metadatas,
+                ids=ids
+            )
+        untrained.clear()
+        return vectorstore
+        
+    def _create_faiss_store(self, training_vectors: np.ndarray) -> FAISS:
+        """
+        Create an empty FAISS store sized for the given vectors
+        
+        At least config.rag.faiss_ivf_min_train vectors train an IVF-PQ
+        index (product-quantized, much smaller and faster to scan at
+        scale); anything smaller uses an exact flat inner-product index, or
+        an int8 scalar-quantized one when config.rag.faiss_int8 is set. Embeddings are unit length, so inner
+        product equals cosine similarity.
+        """
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores.utils import DistanceStrategy
+        
+        count, dim = training_vectors.shape
+        if count >= config.rag.faiss_ivf_min_train and dim % config.rag.faiss_pq_m == 0:
+            nlist = min(config.rag.faiss_nlist, count // 39)
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFPQ(
+                quantizer, dim, nlist, config.rag.faiss_pq_m, 8, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(training_vectors)
+            index.nprobe = config.rag.faiss_nprobe
+            logger.info(f"📐 Trained IVF-PQ index (nlist={nlist}) on {count} vectors")
+        elif config.rag.faiss_int8:
+            # One byte per component: a quarter of the flat index's memory
+            # and scan bandwidth, ranges trained on the whole corpus
+            index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            index.train(training_vectors)
+        else:
+            index = faiss.IndexFlatIP(dim)
+            
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={},
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+        
+    def _fingerprint(self, files: List[PythonFile], file_hashes: Dict[str, str]) -> str:
+        """Key for a codebase's index: every file path and hash, plus the chunking and embedding settings"""
+        digest = hashlib.blake2b(digest_size=16)
+        settings = (
+            self.embeddings.model_name,
+            self.splitter_settings,
+            config.rag.insert_batch_size,
+            config.rag.faiss_ivf_min_train,
+            config.rag.faiss_nlist,
+            config.rag.faiss_pq_m,
+            config.rag.faiss_nprobe,
+            config.rag.faiss_int8
+        )
+        digest.update(repr(settings).encode("utf-8"))
+        for f in sorted(files, key=lambda f: f.path):
+            digest.update(f"{f.path}\0{f.relative_path}\0{file_hashes[f.relative_path]}\0".encode("utf-8"))
+        return digest.hexdigest()
+        
+    def _load_faiss_store(self, index_dir: Path) -> FAISS:
+        """Load an index saved by _save_faiss_store"""
+        from langchain_community.vectorstores.utils import DistanceStrategy
+        
+        # The pickled docstore was written by this application, not downloaded
+        return FAISS.load_local(
+            str(index_dir),
+            self.embeddings,
+            allow_dangerous_deserialization=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+        
+    def _save_faiss_store(self, vectorstore: FAISS, index_dir: Path) -> None:
+        """Save the index to a temp directory, then rename it into place"""
+        tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+        vectorstore.save_local(str(tmp_dir))
+        try:
+            os.replace(tmp_dir, index_dir)
+        except OSError as e:
+            # Another run saved the same fingerprint first
+            logger.warning(f"Could not cache index in {index_dir}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            
+    def _collection_name(self, files: List[PythonFile]) -> str:
+        """Collection name; persisted stores get one collection per codebase"""
+        if not config.rag.persist_dir:
+            return config.rag.collection_name
+        root = os.path.commonpath([os.path.abspath(f.path) for f in files])
+        return f"{config.rag.collection_name}_{hashlib.sha1(root.encode('utf-8')).hexdigest()[:16]}"
+        
+    def build_vectorstore(
+        self,
+        files: List[PythonFile],
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> VectorStore:
         """
         Create a vector store from Python files
         
+        Chunks are streamed into the store in batches of
+        config.rag.insert_batch_size, so peak memory is bounded by the batch
+        size rather than the size of the codebase. Each batch is embedded on
+        a background thread while the previous one is inserted, so the
+        embedding requests never wait on store writes. When config.rag.persist_dir
+        is set (Chroma backend only), a manifest of file hashes is kept next to the store and only
+        files that changed since the last run are re-split and re-embedded.
+        With FAISS, the finished index is saved under
+        config.rag.index_cache_dir keyed by a fingerprint of the codebase and
+        loaded as-is when the same files are seen again.
+        
         Args:
             files: List of PythonFile objects
+            on_progress: Called with (files_processed, files_to_process) after each batch
             
         Returns:
-            Chroma vector store
+            Chroma or FAISS vector store, depending on the resolved backend
         """
         if not files:
             raise ValueError("No files provided for vector store creation")
             
-        documents = []
-        metadatas = []
-        
         try:
-            for file in files:
-                chunks = self.text_splitter.split_text(file.content)
-                for chunk in chunks:
-                    documents.append(chunk)
-                    metadatas.append({
-                        "source": file.relative_path,
-                        "full_path": file.path,
-                        "file_size": file.size,
-                        "file_lines": file.lines
-                    })
+            logger.info(f"📚 Creating vector store from {len(files)} files...")
             
-            logger.info(f"📚 Creating vector store with {len(documents)} chunks...")
+            file_hashes = {
+                f.relative_path: hashlib.sha256(f.content.encode("utf-8")).hexdigest()
+                for f in files
+            }
             
-            vectorstore = Chroma.from_texts(
-                texts=documents,
-                embedding=self.embeddings,
-                metadatas=metadatas
-            )
+            index_dir = None
+            if self.backend == "faiss" and config.rag.index_cache_dir:
+                index_dir = Path(config.rag.index_cache_dir).expanduser() / self._fingerprint(files, file_hashes)
+                if (index_dir / "index.faiss").exists():
+                    logger.info(f"♻️  Loading cached index for unchanged codebase from {index_dir}")
+                    if on_progress:
+                        on_progress(len(files), len(files))
+                    return self._load_faiss_store(index_dir)
+            
+            vectorstore = None
+            collection_name = self._collection_name(files)
+            if self.backend == "chroma":
+                # Embeddings are unit length, so inner product is cosine
+                # similarity without the per-distance norm computations
+                vectorstore = Chroma(
+                    collection_name=collection_name,
+                    embedding_function=self.embeddings,
+                    persist_directory=config.rag.persist_dir,
+                    collection_metadata={"hnsw:space": "ip"}
+                )
+            
+            manifest_path = None
+            manifest: Dict[str, Dict[str, Any]] = {}
+            if self.backend == "chroma" and config.rag.persist_dir:
+                manifest_path = Path(config.rag.persist_dir) / f"{collection_name}.manifest.json"
+                manifest = _load_manifest(manifest_path)
+                
+            # Drop chunks of files that were deleted or changed
+            stale_ids = []
+            for path in list(manifest):
+                if file_hashes.get(path) != manifest[path]["hash"]:
+                    stale_ids.extend(manifest.pop(path)["chunk_ids"])
+            for start in range(0, len(stale_ids), config.rag.insert_batch_size):
+                vectorstore._collection.delete(ids=stale_ids[start:start + config.rag.insert_batch_size])
+                
+            changed = [f for f in files if f.relative_path not in manifest]
+            if len(changed) < len(files):
+                logger.info(f"⏭️  Skipping {len(files) - len(changed)} unchanged files")
+            for f in changed:
+                manifest[f.relative_path] = {"hash": file_hashes[f.relative_path], "chunk_ids": []}
+            
+            batch_size = config.rag.insert_batch_size
+            batch_ids, batch_docs, batch_metas = [], [], []
+            # FAISS batches held back until the index type is decided
+            untrained = []
+            inserted = 0
+            # (embedding future, ids, documents, metadatas, last file number)
+            pending: Optional[Tuple[Future, List[str], List[str], List[Dict[str, Any]], int]] = None
             
-            logger.info(f"✅ Vector store created successfully")
+            with ThreadPoolExecutor(max_workers=1) as embedder:
+                for file_number, chunk_id, chunk, metadata in self._iter_chunks(changed, file_hashes):
+                    batch_ids.append(chunk_id)
+                    batch_docs.append(chunk)
+                    batch_metas.append(metadata)
+                    manifest[metadata["source"]]["chunk_ids"].append(chunk_id)
+                    
+                    if len(batch_docs) >= batch_size:
+                        future = embedder.submit(self._embed_batch, batch_docs)
+                        if pending:
+                            vectorstore = self._add_batch(vectorstore, *pending[1:4], pending[0].result(), untrained)
+                            inserted += len(pending[2])
+                            if on_progress:
+                                on_progress(pending[4], len(changed))
+                        pending = (future, batch_ids, batch_docs, batch_metas, file_number)
+                        batch_ids, batch_docs, batch_metas = [], [], []
+                        
+                if pending:
+                    vectorstore = self._add_batch(vectorstore, *pending[1:4], pending[0].result(), untrained)
+                    inserted += len(pending[2])
+                    if on_progress:
+                        on_progress(pending[4], len(changed))
+                        
+            if batch_docs:
+                vectorstore = self._add_batch(
+                    vectorstore, batch_ids, batch_docs, batch_metas, self._embed_batch(batch_docs), untrained
+                )
+                inserted += len(batch_docs)
+                
+            if untrained:
+                # The whole corpus is below faiss_ivf_min_train
+                vectorstore = self._flush_untrained(untrained)
+                
+            if vectorstore is None:
+                raise ValueError("No content to index: every file is empty")
+                
+            if manifest_path:
+                _save_manifest(manifest_path, manifest)
+            if index_dir:
+                self._save_faiss_store(vectorstore, index_dir)
+                
+            if on_progress:
+                on_progress(len(changed), len(changed))
+            
+            logger.info(f"✅ Vector store created successfully ({inserted} new chunks)")
             return vectorstore
             
         except Exception as e:
@@ -73,11 +592,4 @@ class RAGContextBuilder:
     
     def get_context_summary(self, files: List[PythonFile]) -> str:
         """Generate a summary of the codebase context"""
-        file_list = "\n".join([f"- {f.relative_path} ({f.lines} lines)" for f in files])
-        
-        return f"""Files in the codebase:
-{file_list}
-
-Total files: {len(files)}
-Total lines: {sum(f.lines for f in files)}
-Average lines per file: {sum(f.lines for f in files) / len(files):.1f}"""
+        return _context_summary(tuple((f.relative_path, f.lines) for f in files))
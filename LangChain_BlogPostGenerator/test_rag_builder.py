@@ -0,0 +1,79 @@
+"""
+Unit tests for the RAG text splitters
+"""
+
+import unittest
+import sys
+import os
+
+# Add the script directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from rag_builder import SinglePassTextSplitter
+from config import RAGConfig
+
+
+SEPARATORS = RAGConfig().separators
+TWO_FUNCTIONS = "def a():\n    return 1\n\ndef b():\n    return 2\n"
+
+
+def _overlap(previous: str, current: str) -> int:
+    """Length of the longest suffix of previous that starts current"""
+    for size in range(min(len(previous), len(current)), 0, -1):
+        if previous.endswith(current[:size]):
+            return size
+    return 0
+
+
+class TestSinglePassTextSplitter(unittest.TestCase):
+    """Test cases for the offset-based splitter"""
+    
+    def setUp(self):
+        """Use a real module from this project as the sample file"""
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "agents.py")) as f:
+            self.source = f.read()
+        self.settings = [(1000, 200), (300, 50), (40, 10), (10, 3)]
+    
+    def test_chunks_fit_chunk_size(self):
+        """Test no chunk exceeds chunk_size"""
+        for chunk_size, chunk_overlap in self.settings:
+            splitter = SinglePassTextSplitter(chunk_size, chunk_overlap, SEPARATORS)
+            for chunk in splitter.split_text(self.source):
+                self.assertLessEqual(len(chunk), chunk_size)
+    
+    def test_overlap_is_bounded(self):
+        """Test consecutive chunks overlap by at most chunk_overlap"""
+        for chunk_size, chunk_overlap in self.settings:
+            chunks = SinglePassTextSplitter(chunk_size, chunk_overlap, SEPARATORS).split_text(self.source)
+            for previous, current in zip(chunks, chunks[1:]):
+                self.assertLessEqual(_overlap(previous, current), chunk_overlap)
+    
+    def test_matches_recursive_splitter(self):
+        """Test chunks are identical to RecursiveCharacterTextSplitter's"""
+        for chunk_size, chunk_overlap in self.settings:
+            recursive = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=SEPARATORS
+            )
+            splitter = SinglePassTextSplitter(chunk_size, chunk_overlap, SEPARATORS)
+            self.assertEqual(splitter.split_text(self.source), recursive.split_text(self.source))
+    
+    def test_small_chunks_keep_tokens_whole(self):
+        """Test words shorter than chunk_size are never cut or repeated"""
+        chunks = SinglePassTextSplitter(10, 3, SEPARATORS).split_text(TWO_FUNCTIONS)
+        self.assertEqual(chunks, ["def a():", "return", "1", "def b():", "return", "2"])
+    
+    def test_separators_without_empty_fallback(self):
+        """Test text with no separator left is kept whole, as the recursive splitter does"""
+        separators = ["\n", " "]
+        recursive = RecursiveCharacterTextSplitter(chunk_size=5, chunk_overlap=0, separators=separators)
+        splitter = SinglePassTextSplitter(5, 0, separators)
+        self.assertEqual(splitter.split_text(TWO_FUNCTIONS), recursive.split_text(TWO_FUNCTIONS))
+    
+    def test_empty_text(self):
+        """Test empty text gives no chunks"""
+        self.assertEqual(SinglePassTextSplitter(100, 10, SEPARATORS).split_text(""), [])
+
+if __name__ == '__main__':
+    unittest.main()
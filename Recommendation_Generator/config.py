@@ -2,21 +2,62 @@
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
 
-# Ollama settings
-OLLAMA_URL: str = os.getenv("OLLAMA_URL", "http://localhost:11434")
-OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.2")
-OLLAMA_TIMEOUT_S: float = float(os.getenv("OLLAMA_TIMEOUT_S", "120"))
 
-# Recommender specifics
-RECOMMENDATION_COUNT: int = int(os.getenv("RECOMMENDATION_COUNT", "10"))
-MAX_LIKES: int = int(os.getenv("MAX_LIKES", "50"))
+@dataclass(frozen=True, slots=True)
+class Settings:
+    # Ollama settings
+    OLLAMA_URL: str
+    OLLAMA_MODEL: str
+    OLLAMA_TIMEOUT_S: float
+    OLLAMA_EMBED_MODEL: str
 
-# Request retry/backoff for synchronous calls
-REQUESTS_RETRIES: int = int(os.getenv("REQUESTS_RETRIES", "2"))
-REQUESTS_BACKOFF_S: float = float(os.getenv("REQUESTS_BACKOFF_S", "0.5"))
+    # Recommender specifics
+    RECOMMENDATION_COUNT: int
+    MAX_LIKES: int
 
-# Webserver defaults
-HOST: str = os.getenv("HOST", "0.0.0.0")
-PORT: int = int(os.getenv("PORT", "5000"))
-LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Semantic response cache
+    SEMCACHE_PATH: str
+    SEMCACHE_THRESHOLD: float
+    SEMCACHE_TTL_S: float
+
+    # Request retry/backoff for synchronous calls
+    REQUESTS_RETRIES: int
+    REQUESTS_BACKOFF_S: float
+
+    # Webserver defaults
+    HOST: str
+    PORT: int
+    LOG_LEVEL: str
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Settings:
+    """Parse the environment once and return the shared settings."""
+    return Settings(
+        OLLAMA_URL=os.getenv("OLLAMA_URL", "http://localhost:11434"),
+        OLLAMA_MODEL=os.getenv("OLLAMA_MODEL", "llama3.2"),
+        OLLAMA_TIMEOUT_S=float(os.getenv("OLLAMA_TIMEOUT_S", "120")),
+        OLLAMA_EMBED_MODEL=os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text"),
+        RECOMMENDATION_COUNT=int(os.getenv("RECOMMENDATION_COUNT", "10")),
+        MAX_LIKES=int(os.getenv("MAX_LIKES", "50")),
+        SEMCACHE_PATH=os.getenv("SEMCACHE_PATH", ".recommend_cache.db"),
+        SEMCACHE_THRESHOLD=float(os.getenv("SEMCACHE_THRESHOLD", "0.95")),
+        SEMCACHE_TTL_S=float(os.getenv("SEMCACHE_TTL_S", "86400")),
+        REQUESTS_RETRIES=int(os.getenv("REQUESTS_RETRIES", "2")),
+        REQUESTS_BACKOFF_S=float(os.getenv("REQUESTS_BACKOFF_S", "0.5")),
+        HOST=os.getenv("HOST", "0.0.0.0"),
+        PORT=int(os.getenv("PORT", "5000")),
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO"),
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keeps `from config import OLLAMA_URL` working
+    try:
+        return getattr(get_config(), name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -1,13 +1,20 @@
 # recommender/client.py
 from __future__ import annotations
 
+import asyncio
 import logging
-import time
-from typing import Any, Dict, Optional
+import weakref
+from typing import Any, Dict, List, Optional
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from urllib3.util.retry import Retry
 
 from config import (
+    OLLAMA_EMBED_MODEL,
     OLLAMA_URL,
     OLLAMA_MODEL,
     OLLAMA_TIMEOUT_S,
@@ -18,13 +25,51 @@ from config import (
 logger = logging.getLogger("recommender.client")
 
 
-def call_ollama_sync(prompt: str, model: str = OLLAMA_MODEL, timeout_s: float = OLLAMA_TIMEOUT_S) -> str:
+def _build_session() -> requests.Session:
     """
-    Synchronously call Ollama /api/generate with stream=False and return the final text.
-    Does simple retries for transient network errors and non-5xx responses.
+    Shared session so calls reuse warm keep-alive connections to Ollama.
+    Retries connection errors and 5xx responses with exponential backoff;
+    4xx responses are returned as-is.
     """
-    url = f"{OLLAMA_URL}/api/generate"
-    payload: Dict[str, Any] = {
+    retry = Retry(
+        total=REQUESTS_RETRIES,
+        backoff_factor=REQUESTS_BACKOFF_S,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        # Hand the last 5xx response back instead of raising MaxRetryError
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _build_session()
+# Pooled connections belong to the event loop that opened them, so a single
+# module-wide AsyncClient breaks ("Event loop is closed") for callers that
+# start a new loop per request with asyncio.run(). Each loop gets its own
+# client instead, dropped along with the loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the running event loop's shared AsyncClient, created on first use."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(
+            timeout=OLLAMA_TIMEOUT_S,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        )
+    return client
+
+
+def _generate_payload(prompt: str, model: str) -> Dict[str, Any]:
+    return {
         "model": model,
         "prompt": prompt,
         # No max_tokens field included by design
@@ -32,59 +77,135 @@ def call_ollama_sync(prompt: str, model: str = OLLAMA_MODEL, timeout_s: float =
         "top_p": 0.95,
         "stream": False,  # request non-streaming behavior
     }
+
+
+def _error_snippet(resp: Any) -> str:
+    # Decode only the bytes we show instead of the whole body
+    return resp.content[:200].decode("utf-8", "replace")
+
+
+def _extract_text(resp: Any) -> str:
+    """
+    Pull the generated text out of a successful /api/generate response
+    (a requests or httpx response; both expose the raw body as .content).
+    """
+    try:
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
+        text = resp.content.decode("utf-8", "replace")
+        if not text:
+            raise ValueError("Empty response from Ollama")
+        return text
+
+    # Common shapes for non-streaming output
+    if isinstance(data, dict):
+        for key in ("text", "response", "generated", "output"):
+            if key in data and isinstance(data[key], str):
+                return data[key]
+        if "choices" in data and isinstance(data["choices"], list) and data["choices"]:
+            first = data["choices"][0]
+            if isinstance(first, dict):
+                if "text" in first and isinstance(first["text"], str):
+                    return first["text"]
+                if "message" in first and isinstance(first["message"], dict):
+                    msg = first["message"]
+                    if "content" in msg and isinstance(msg["content"], str):
+                        return msg["content"]
+    if isinstance(data, str):
+        return data
+
+    text = resp.content.decode("utf-8", "replace")
+    if text:
+        return text
+
+    logger.error("No usable field found in Ollama response JSON")
+    raise RuntimeError("Could not extract text from Ollama response")
+
+
+def call_ollama_sync(prompt: str, model: str = OLLAMA_MODEL, timeout_s: float = OLLAMA_TIMEOUT_S) -> str:
+    """
+    Synchronously call Ollama /api/generate with stream=False and return the final text.
+    Transient network errors and 5xx responses are retried by the session.
+    """
+    url = f"{OLLAMA_URL}/api/generate"
+    payload = _generate_payload(prompt, model)
     headers = {"Content-Type": "application/json"}
 
-    last_exc: Optional[Exception] = None
-    for attempt in range(1, REQUESTS_RETRIES + 2):
-        try:
-            resp = requests.post(url, json=payload, headers=headers, timeout=timeout_s)
-        except requests.RequestException as exc:
-            last_exc = exc
-            logger.warning("Ollama request failed (attempt %d): %s", attempt, exc)
-            if attempt <= REQUESTS_RETRIES:
-                time.sleep(REQUESTS_BACKOFF_S * attempt)
-            continue
-
-        if resp.status_code != 200:
-            last_exc = RuntimeError(f"Ollama returned status {resp.status_code}: {resp.text[:200]}")
-            logger.error("Ollama HTTP error (status=%s) attempt %d", resp.status_code, attempt)
-            # Do not retry on client errors
-            if 400 <= resp.status_code < 500:
-                break
-            if attempt <= REQUESTS_RETRIES:
-                time.sleep(REQUESTS_BACKOFF_S * attempt)
-            continue
-
-        try:
-            data = resp.json()
-        except ValueError:
-            text = resp.text or ""
-            if not text:
-                raise ValueError("Empty response from Ollama")
-            return text
-
-        # Common shapes for non-streaming output
-        if isinstance(data, dict):
-            for key in ("text", "response", "generated", "output"):
-                if key in data and isinstance(data[key], str):
-                    return data[key]
-            if "choices" in data and isinstance(data["choices"], list) and data["choices"]:
-                first = data["choices"][0]
-                if isinstance(first, dict):
-                    if "text" in first and isinstance(first["text"], str):
-                        return first["text"]
-                    if "message" in first and isinstance(first["message"], dict):
-                        msg = first["message"]
-                        if "content" in msg and isinstance(msg["content"], str):
-                            return msg["content"]
-        if isinstance(data, str):
-            return data
-
-        text = resp.text or ""
-        if text:
-            return text
-
-        last_exc = RuntimeError("Could not extract text from Ollama response")
-        logger.error("No usable field found in Ollama response JSON")
-
-    raise RuntimeError(f"Failed to get response from Ollama after retries: {last_exc}")
+    try:
+        resp = _session.post(url, json=payload, headers=headers, timeout=timeout_s)
+    except requests.RequestException as exc:
+        logger.error("Ollama request failed: %s", exc)
+        raise RuntimeError(f"Failed to get response from Ollama after retries: {exc}") from exc
+
+    if resp.status_code != 200:
+        logger.error("Ollama HTTP error (status=%s)", resp.status_code)
+        raise RuntimeError(f"Ollama returned status {resp.status_code}: {_error_snippet(resp)}")
+
+    return _extract_text(resp)
+
+
+class _ServerError(Exception):
+    """A 5xx response, raised so the async retry policy sees it."""
+
+    def __init__(self, resp: httpx.Response) -> None:
+        super().__init__(f"Ollama returned status {resp.status_code}: {_error_snippet(resp)}")
+        self.resp = resp
+
+
+@retry(
+    stop=stop_after_attempt(REQUESTS_RETRIES + 1),
+    wait=wait_exponential(multiplier=REQUESTS_BACKOFF_S),
+    retry=retry_if_exception_type((httpx.TransportError, _ServerError)),
+    reraise=True,
+)
+async def _post_async(
+    url: str, payload: Dict[str, Any], timeout_s: float, client: Optional[httpx.AsyncClient] = None
+) -> httpx.Response:
+    resp = await (client or _get_async_client()).post(url, json=payload, timeout=timeout_s)
+    if resp.status_code >= 500:
+        raise _ServerError(resp)
+    return resp
+
+
+async def call_ollama_async(
+    prompt: str,
+    model: str = OLLAMA_MODEL,
+    timeout_s: float = OLLAMA_TIMEOUT_S,
+    client: Optional[httpx.AsyncClient] = None,
+) -> str:
+    """
+    Async variant of call_ollama_sync for async views, so concurrent requests
+    are in flight against Ollama together instead of each holding a worker.
+    Ollama only runs them in parallel up to OLLAMA_NUM_PARALLEL (set on the
+    Ollama server); the rest queue there.
+
+    Pass `client` to use an AsyncClient you own (and close). Otherwise each
+    event loop shares one client of its own, so sync callers may wrap every
+    request in asyncio.run(), though they then reconnect per request.
+    """
+    url = f"{OLLAMA_URL}/api/generate"
+    try:
+        resp = await _post_async(url, _generate_payload(prompt, model), timeout_s, client)
+    except (httpx.HTTPError, _ServerError) as exc:
+        logger.error("Ollama request failed: %s", exc)
+        raise RuntimeError(f"Failed to get response from Ollama after retries: {exc}") from exc
+
+    if resp.status_code != 200:
+        logger.error("Ollama HTTP error (status=%s)", resp.status_code)
+        raise RuntimeError(f"Ollama returned status {resp.status_code}: {_error_snippet(resp)}")
+
+    return _extract_text(resp)
+
+
+def embed_ollama_sync(text: str, model: str = OLLAMA_EMBED_MODEL, timeout_s: float = OLLAMA_TIMEOUT_S) -> List[float]:
+    """
+    Synchronously embed a single text with Ollama /api/embed and return the vector.
+    """
+    url = f"{OLLAMA_URL}/api/embed"
+    resp = _session.post(url, json={"model": model, "input": text}, timeout=timeout_s)
+    if resp.status_code != 200:
+        raise RuntimeError(f"Ollama embed returned status {resp.status_code}: {_error_snippet(resp)}")
+    embeddings = orjson.loads(resp.content).get("embeddings")
+    if not embeddings:
+        raise RuntimeError("Ollama embed response contained no embeddings")
+    return embeddings[0]
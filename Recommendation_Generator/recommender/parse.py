@@ -2,53 +2,130 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+import sys
+from functools import lru_cache
+from typing import List, NamedTuple, Set, Tuple
+
+import orjson
 
 from config import RECOMMENDATION_COUNT
 
+try:
+    # RE2 matches in linear time, so pathological model output can't
+    # trigger catastrophic backtracking
+    import re2  # type: ignore[import-untyped, import-not-found]
+except ImportError:
+    re2 = None
+
+
+class Rec(NamedTuple):
+    """One parsed recommendation; use ._asdict() for a JSON-ready dict."""
+
+    title: str
+    reason: str
+    # Casefolded title, computed once while parsing, for callers that
+    # dedup or match across results
+    key: str
+
+
+def _compile(pattern: str):
+    """Compile with RE2 when available, stdlib re for anything RE2 rejects."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
 
-def parse_recommendations(text: str, expected: int = RECOMMENDATION_COUNT) -> List[Dict[str, str]]:
+
+# One pass over the whole text: each match is one line, either
+# "1. Title — Reason", "1. Title", "Title - Reason", "Title" or, failing
+# those, the raw line. Every group starts and ends on a non-space, so no two
+# quantifiers compete for the same whitespace: matching stays linear even
+# with the backtracking stdlib engine.
+_LINE_RE = _compile(
+    r'(?m)^[ \t]*(?:'
+    r'(?:(?P<num>\d+)[\.\)][ \t]*)?'
+    r'(?:(?P<title>[^—–\-\s](?:[^—–\-\n]*[^—–\-\s])?)[ \t\r]*)?'
+    r'(?:[-—–][ \t]*(?P<reason>\S[^\n]*))?'
+    r'|(?P<raw>[^\n]*\S)[ \t\r]*'
+    r')$'
+)
+_TITLE_STRIP = " \"'"
+# Longer texts are parsed without caching so the cache can't pin big strings
+_CACHE_MAX_CHARS = 32_768
+
+
+def parse_recommendations(text: str, expected: int = RECOMMENDATION_COUNT) -> List[Rec]:
     """
     Parse lines like:
       1. Title — Reason.
-    into [{'title': ..., 'reason': ...}, ...]
+    into [Rec(title=..., reason=...), ...]
     """
     if not text:
         return []
 
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    recs: List[Dict[str, str]] = []
-    pattern = re.compile(r'^\s*(?:\d+[\.\)]\s*)?(?P<title>[^—–\-–\n\r]+?)\s*[-—–]\s*(?P<reason>.+)$')
-    for ln in lines:
-        m = pattern.match(ln)
-        if m:
-            title = m.group("title").strip(" \"' ")
-            reason = m.group("reason").strip()
-            if title and len(title) > 1:
-                recs.append({"title": title, "reason": reason})
-            continue
-        m2 = re.match(r'^\s*(\d+)[\.\)]\s*(.+)$', ln)
-        if m2:
-            title = m2.group(2).strip(" \"' ")
-            recs.append({"title": title, "reason": ""})
-            continue
-        m3 = re.match(r'^(?P<title>[^—–\-–]+)\s*[-—–]\s*(?P<reason>.+)$', ln)
-        if m3:
-            recs.append({"title": m3.group("title").strip(), "reason": m3.group("reason").strip()})
-            continue
-        if len(ln) < 60:
-            recs.append({"title": ln.strip(" \"' "), "reason": ""})
-
-    # Deduplicate while preserving order and truncate to expected
-    seen = set()
-    unique: List[Dict[str, str]] = []
-    for r in recs:
-        key = r["title"].lower()
+    # Retries and repeated model answers hit the cache; Recs are immutable,
+    # so only the list needs copying
+    parse = _parse_cached if len(text) <= _CACHE_MAX_CHARS else _parse
+    return list(parse(text, expected))
+
+
+def _parse(text: str, expected: int) -> Tuple[Rec, ...]:
+    # Deduplicate while parsing, so a chatty model's extra lines are never
+    # matched once `expected` unique titles are in
+    seen: Set[str] = set()
+    unique: List[Rec] = []
+    for m in _LINE_RE.finditer(text):
+        title, num, reason = m.group("title"), m.group("num"), m.group("reason")
+        if title is None and num is None:
+            # Raw line, e.g. one starting with a dash; keep it whole if short
+            line = m.group(0).strip()
+            title = line.strip(_TITLE_STRIP)
+            if not title or len(line) >= 60:
+                continue
+            reason = ""
+        else:
+            title = (title or "").strip(_TITLE_STRIP)
+            if not title:
+                continue
+            if reason is not None:
+                if len(title) <= 1:
+                    continue
+                reason = reason.strip()
+            elif num is not None or len(m.group(0).strip()) < 60:
+                reason = ""
+            else:
+                continue
+
+        key = title.casefold()
+        if len(key) < 64:
+            key = sys.intern(key)
         if key in seen:
             continue
         seen.add(key)
-        unique.append(r)
+        unique.append(Rec(title, reason, key))
         if len(unique) >= expected:
             break
 
-    return unique
+    return tuple(unique)
+
+
+_parse_cached = lru_cache(maxsize=512)(_parse)
+
+
+def parse_recommendations_batch(
+    texts: List[str], expected: int = RECOMMENDATION_COUNT
+) -> List[List[Rec]]:
+    """Parse many model outputs, e.g. for offline evaluation or backfills."""
+    return [parse_recommendations(t, expected) for t in texts]
+
+
+def dumps_recommendations(recs: List[Rec]) -> bytes:
+    """
+    Serialize recs for the browser as {"titles": [...], "reasons": [...]}.
+
+    Two flat string arrays encode in one pass, without a dict per item.
+    """
+    titles, reasons, _ = zip(*recs) if recs else ((), (), ())
+    return orjson.dumps({"titles": titles, "reasons": reasons})
@@ -1,42 +1,66 @@
 # recommender/schemas.py
 from __future__ import annotations
 
-from typing import Any, List
+from typing import Annotated, List
 
-from pydantic import BaseModel, Field, field_validator, ValidationError
+from pydantic import BaseModel, Field, StringConstraints, conlist, field_validator, ValidationError
 
 from config import MAX_LIKES
 
+try:
+    import msgspec
+except ImportError:  # optional: decode_likes() then goes through pydantic
+    msgspec = None
+
+# Stripping, emptiness and length checks run inside pydantic-core rather
+# than in a Python loop
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
 
 class LikesPayload(BaseModel):
-    likes: List[str] = Field(..., description="List of show titles the user enjoys")
+    likes: conlist(NonEmptyStr, min_length=1, max_length=MAX_LIKES) = Field(
+        ..., description="List of show titles the user enjoys"
+    )
 
-    @field_validator("likes")
+    @field_validator("likes", mode="after")
     @classmethod
-    def validate_and_clean_likes(cls, v: List[Any]) -> List[str]:
-        if not isinstance(v, list) or not v:
-            raise ValueError("likes must be a non-empty list of strings")
-
-        cleaned: List[str] = []
-        for i, item in enumerate(v):
-            if not isinstance(item, str):
-                raise ValueError(f"likes[{i}] must be a string")
-            s = item.strip()
-            if not s:
-                raise ValueError(f"likes[{i}] must not be empty or whitespace")
-            cleaned.append(s)
-
-        if len(cleaned) > MAX_LIKES:
-            raise ValueError(f"likes list too large; maximum is {MAX_LIKES}")
-
-        # Deduplicate while preserving order (case-insensitive)
-        seen = set()
-        deduped: List[str] = []
-        for t in cleaned:
-            key = t.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(t)
-
-        return deduped
+    def validate_and_clean_likes(cls, v: List[str]) -> List[str]:
+        return _dedup_ci(v)
+
+
+def _dedup_ci(items: List[str]) -> List[str]:
+    """Drop case-insensitive duplicates, keeping the first spelling in order"""
+    keys = list(map(str.casefold, items))
+    # Built from the reversed list, so the first occurrence's casing wins
+    first = dict(zip(reversed(keys), reversed(items)))
+    return [first[k] for k in dict.fromkeys(keys)]
+
+
+if msgspec is not None:
+
+    class _LikesStruct(msgspec.Struct):
+        likes: Annotated[List[str], msgspec.Meta(min_length=1, max_length=MAX_LIKES)]
+
+        def __post_init__(self) -> None:
+            self.likes = [s.strip() for s in self.likes]
+            if not all(self.likes):
+                raise ValueError("likes must not contain empty titles")
+            self.likes = _dedup_ci(self.likes)
+
+    _decode_struct = msgspec.json.Decoder(_LikesStruct).decode
+
+
+def decode_likes(raw: bytes) -> List[str]:
+    """
+    Decode and clean a {"likes": [...]} request body.
+
+    With msgspec installed, valid bodies are parsed and checked in one C
+    pass. Anything it rejects is re-validated by LikesPayload, so callers
+    always see pydantic's ValidationError and messages.
+    """
+    if msgspec is not None:
+        try:
+            return _decode_struct(raw).likes
+        except (msgspec.ValidationError, msgspec.DecodeError):
+            pass
+    return LikesPayload.model_validate_json(raw).likes
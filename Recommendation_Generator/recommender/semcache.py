@@ -0,0 +1,221 @@
+# recommender/semcache.py
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import SEMCACHE_THRESHOLD, SEMCACHE_TTL_S
+
+logger = logging.getLogger("recommender.semcache")
+
+try:
+    import sqlite_vec
+except ImportError:  # optional: falls back to an in-memory matrix scan
+    sqlite_vec = None
+
+Recommendations = List[Dict[str, str]]
+
+
+def cache_key(likes: Sequence[str]) -> str:
+    """Order- and case-insensitive key for a likes list."""
+    return "\n".join(sorted(s.strip().casefold() for s in likes))
+
+
+# Unit vectors have every component in [-1, 1], so one global scale fits all
+_Q8_SCALE = 127.0
+# Rows converted back to float32 at a time while scanning
+_SCAN_BLOCK = 4096
+# Approximate matches re-scored exactly from the stored float32 vectors
+_RESCORE_TOP = 4
+
+
+def _normalize(vec: Sequence[float]) -> np.ndarray:
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(arr)) or 1.0
+    return arr / norm
+
+
+def _quantize(vec: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(vec * _Q8_SCALE), -127, 127).astype(np.int8)
+
+
+class SemanticCache:
+    """
+    Caches recommendation responses keyed by the embedding of the likes list.
+
+    A lookup returns the stored response of the most similar cached entry when
+    cosine similarity >= threshold, so near-duplicate requests (same shows in a
+    different order, different casing, an extra near-synonym) skip the LLM.
+    Entries are namespaced by model name and expire after ttl_s seconds.
+    Uses the sqlite-vec extension for the nearest-neighbour search when it is
+    installed. Otherwise this model's vectors are kept in memory as a
+    contiguous (N, d) int8 matrix (a quarter of the float32 size) and
+    scored with blockwise matrix-vector products; the few best approximate
+    matches are re-scored exactly from the float32 vectors in SQLite before
+    the threshold check. Entries written by other processes are picked up on
+    the next start.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embed: Callable[[str], List[float]],
+        model: str,
+        threshold: float = SEMCACHE_THRESHOLD,
+        ttl_s: float = SEMCACHE_TTL_S,
+    ) -> None:
+        self.embed = embed
+        self.model = model
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " embedding BLOB NOT NULL,"
+            " response TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._use_vec = False
+        if sqlite_vec is not None:
+            try:
+                self._conn.enable_load_extension(True)
+                sqlite_vec.load(self._conn)
+                self._conn.enable_load_extension(False)
+                self._use_vec = True
+            except (AttributeError, sqlite3.Error) as exc:
+                logger.warning("sqlite-vec unavailable, using in-memory scan: %s", exc)
+
+        # In-memory corpus for the scan path; rows beyond _size are spare capacity
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._created = np.empty(0, dtype=np.float64)
+        self._matrix: Optional[np.ndarray] = None
+        if not self._use_vec:
+            self._load_matrix()
+
+    def _load_matrix(self) -> None:
+        rows = self._conn.execute(
+            "SELECT id, created, embedding FROM entries WHERE model = ? AND created >= ?",
+            (self.model, time.time() - self.ttl_s),
+        ).fetchall()
+        for rowid, created, blob in rows:
+            self._append(rowid, created, np.frombuffer(blob, dtype=np.float32))
+
+    def _append(self, rowid: int, created: float, vec: np.ndarray) -> None:
+        if self._matrix is None:
+            self._matrix = np.empty((16, vec.shape[0]), dtype=np.int8)
+            self._ids = np.empty(16, dtype=np.int64)
+            self._created = np.empty(16, dtype=np.float64)
+        elif vec.shape[0] != self._matrix.shape[1]:
+            logger.warning("Skipping cached embedding with dimension %d", vec.shape[0])
+            return
+        if self._size == self._matrix.shape[0]:
+            # Double capacity so appends are amortized O(d)
+            capacity = 2 * self._size
+            self._matrix = np.resize(self._matrix, (capacity, self._matrix.shape[1]))
+            self._ids = np.resize(self._ids, capacity)
+            self._created = np.resize(self._created, capacity)
+        self._matrix[self._size] = _quantize(vec)
+        self._ids[self._size] = rowid
+        self._created[self._size] = created
+        self._size += 1
+
+    def _ensure_vec_table(self, dim: int) -> None:
+        # model and created live in the vec0 table so the KNN search filters
+        # on them itself; filtering after a fixed k misses live entries
+        # whenever the nearest k belong to other models or have expired
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'vec_entries'"
+        ).fetchone()
+        if exists:
+            return
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE vec_entries USING vec0("
+            " model TEXT PARTITION KEY,"
+            " created FLOAT,"
+            f" embedding float[{dim}] distance_metric=cosine)"
+        )
+        # Index entries written before this table existed
+        self._conn.execute(
+            "INSERT INTO vec_entries (rowid, model, created, embedding)"
+            " SELECT id, model, created, embedding FROM entries WHERE length(embedding) = ?",
+            (4 * dim,),
+        )
+
+    def _best_match(self, q: np.ndarray) -> Optional[Tuple[int, float]]:
+        """Return (id, similarity) of the closest live entry, if any."""
+        if self._use_vec:
+            self._ensure_vec_table(q.shape[0])
+            row = self._conn.execute(
+                "SELECT rowid, distance FROM vec_entries"
+                " WHERE embedding MATCH ? AND k = 1 AND model = ? AND created >= ?",
+                (q.tobytes(), self.model, time.time() - self.ttl_s),
+            ).fetchone()
+            return (row[0], 1.0 - row[1]) if row else None
+
+        if self._size == 0 or q.shape[0] != self._matrix.shape[1]:
+            return None
+        # Vectors are unit length, so a matvec gives every cosine similarity;
+        # dequantize a block at a time to keep the float32 copy small
+        q_scaled = q / _Q8_SCALE
+        sims = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, _SCAN_BLOCK):
+            stop = min(start + _SCAN_BLOCK, self._size)
+            sims[start:stop] = self._matrix[start:stop].astype(np.float32) @ q_scaled
+        sims[self._created[: self._size] < time.time() - self.ttl_s] = -np.inf
+
+        k = min(_RESCORE_TOP, self._size)
+        top = np.argpartition(sims, -k)[-k:]
+        top = top[np.isfinite(sims[top])]
+        if top.size == 0:
+            return None
+        ids = [int(i) for i in self._ids[top]]
+        placeholders = ",".join("?" * len(ids))
+        rows = self._conn.execute(
+            f"SELECT id, embedding FROM entries WHERE id IN ({placeholders})", ids
+        ).fetchall()
+        scored = [(rowid, float(np.frombuffer(blob, dtype=np.float32) @ q)) for rowid, blob in rows]
+        return max(scored, key=lambda item: item[1]) if scored else None
+
+    def get(self, likes: Sequence[str]) -> Optional[Recommendations]:
+        """Return a cached response for a similar likes list, or None."""
+        q = _normalize(self.embed(cache_key(likes)))
+        with self._lock:
+            match = self._best_match(q)
+            if match is None or match[1] < self.threshold:
+                return None
+            row = self._conn.execute("SELECT response FROM entries WHERE id = ?", (match[0],)).fetchone()
+        if not row:
+            return None
+        logger.info("Semantic cache hit (similarity %.3f)", match[1])
+        return json.loads(row[0])
+
+    def put(self, likes: Sequence[str], recommendations: Recommendations) -> None:
+        """Store a freshly generated response for this likes list."""
+        q = _normalize(self.embed(cache_key(likes)))
+        created = time.time()
+        with self._lock, self._conn:
+            if self._use_vec:
+                # Before the insert, so a first-time backfill doesn't index this row too
+                self._ensure_vec_table(q.shape[0])
+            cur = self._conn.execute(
+                "INSERT INTO entries (model, created, embedding, response) VALUES (?, ?, ?, ?)",
+                (self.model, created, q.tobytes(), json.dumps(recommendations)),
+            )
+            if self._use_vec:
+                self._conn.execute(
+                    "INSERT INTO vec_entries (rowid, model, created, embedding) VALUES (?, ?, ?, ?)",
+                    (cur.lastrowid, self.model, created, q.tobytes()),
+                )
+            else:
+                self._append(cur.lastrowid, created, q)
@@ -1,4 +1,14 @@
 # recommender/templates.py
+import gzip
+import html
+import re
+
+try:
+    import csscompressor
+    import rjsmin
+except ImportError:
+    csscompressor = rjsmin = None
+
 HTML_TEMPLATE = """
 <!doctype html>
 <html lang="en">
@@ -81,7 +91,7 @@ HTML_TEMPLATE = """
           return false;
         }
         const data = await resp.json();
-        renderResults(data.recommendations || []);
+        renderResults(data.titles || [], data.reasons || []);
       } catch (e) {
         setStatus('');
         document.getElementById('error').textContent = 'Network error: ' + (e && e.message ? e.message : String(e));
@@ -90,10 +100,10 @@ HTML_TEMPLATE = """
       return false;
     }
 
-    function renderResults(items) {
+    function renderResults(titles, reasons) {
       const container = document.getElementById('results');
       container.innerHTML = '';
-      if (!items.length) {
+      if (!titles.length) {
         container.innerHTML = '<div class="card">No recommendations found.</div>';
         return;
       }
@@ -102,14 +112,14 @@ HTML_TEMPLATE = """
       const title = document.createElement('h2');
       title.textContent = 'Recommendations';
       card.appendChild(title);
-      items.forEach((it, idx) => {
+      titles.forEach((t, idx) => {
         const p = document.createElement('div');
         p.className = 'rec';
         const strong = document.createElement('strong');
-        strong.textContent = (idx + 1) + '. ' + it.title;
+        strong.textContent = (idx + 1) + '. ' + t;
         p.appendChild(strong);
         const br = document.createElement('div');
-        br.textContent = it.reason || '';
+        br.textContent = reasons[idx] || '';
         br.style.marginLeft = '8px';
         p.appendChild(br);
         card.appendChild(p);
@@ -120,3 +130,39 @@ HTML_TEMPLATE = """
 </body>
 </html>
 """
+
+
+def _minify_block(match: re.Match) -> str:
+    open_tag, body, close_tag = match.groups()
+    if rjsmin is not None:
+        body = csscompressor.compress(body) if open_tag == "<style>" else rjsmin.jsmin(body)
+    else:
+        # Without the minifiers, dropping indentation and blank lines is
+        # still safe for both languages and removes most of the padding
+        body = "\n".join(ln.strip() for ln in body.splitlines() if ln.strip())
+    return open_tag + body + close_tag
+
+
+# Minified once at import; the inline CSS and JS are most of the page
+HTML_TEMPLATE_MIN = re.sub(
+    r"(<style>|<script>)(.*?)(</style>|</script>)", _minify_block, HTML_TEMPLATE, flags=re.S
+)
+
+# Only the textarea's sample text varies, so the static halves are split
+# out and gzipped once. Concatenated gzip members form a valid gzip stream,
+# so a response is just head + compressed sample + tail.
+_HEAD, _TAIL = HTML_TEMPLATE_MIN.split("{{ sample }}")
+_HEAD_GZ = gzip.compress(_HEAD.encode("utf-8"))
+_TAIL_GZ = gzip.compress(_TAIL.encode("utf-8"))
+
+
+def render_page(sample: str = "") -> str:
+    """Return the page with `sample` (HTML-escaped) in the likes textarea."""
+    return _HEAD + html.escape(sample) + _TAIL
+
+
+def render_page_gzip(sample: str = "") -> bytes:
+    """Gzip-encoded render_page(), for clients sending Accept-Encoding: gzip."""
+    if not sample:
+        return _HEAD_GZ + _TAIL_GZ
+    return _HEAD_GZ + gzip.compress(html.escape(sample).encode("utf-8")) + _TAIL_GZ
@@ -0,0 +1,19 @@
+# setup.py
+"""
+Optional native build of the parsing hot loop.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+mypyc compiles recommender/parse.py into an extension module next to the
+source; Python imports it in preference to the .py, and the plain module
+keeps working wherever the build hasn't been run.
+"""
+from mypyc.build import mypycify
+from setuptools import setup
+
+setup(
+    name="recommender",
+    packages=["recommender"],
+    ext_modules=mypycify(["--explicit-package-bases", "recommender/parse.py"]),
+)
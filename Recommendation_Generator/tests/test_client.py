@@ -1,9 +1,12 @@
+import asyncio
 import json
-import requests
+
+import httpx
 from types import SimpleNamespace
 
 import pytest
-from recommender.client import call_ollama_sync
+from recommender import client
+from recommender.client import call_ollama_async, call_ollama_sync
 
 # Use monkeypatch to avoid real HTTP calls and to assert payload shape and stream flag behavior.
 class DummyResp:
@@ -11,6 +14,7 @@ class DummyResp:
         self.status_code = status_code
         self._json = json_data
         self.text = text_data
+        self.content = json.dumps(json_data).encode() if json_data is not None else text_data.encode()
 
     def json(self):
         if self._json is None:
@@ -23,27 +27,69 @@ def test_call_ollama_sync_prefers_text_field(monkeypatch):
         assert "model" in json
         assert "stream" in json and json["stream"] is False
         return DummyResp(json_data={"text": "final output"})
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(client._session, "post", fake_post)
     out = call_ollama_sync("prompt")
     assert out == "final output"
 
 def test_call_ollama_sync_handles_choices(monkeypatch):
     def fake_post(url, json, headers, timeout):
         return DummyResp(json_data={"choices":[{"text":"choice text"}]})
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(client._session, "post", fake_post)
     out = call_ollama_sync("p")
     assert out == "choice text"
 
 def test_call_ollama_sync_fallback_to_raw_text(monkeypatch):
     def fake_post(url, json, headers, timeout):
         return DummyResp(status_code=200, json_data=None, text_data="raw text")
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(client._session, "post", fake_post)
     out = call_ollama_sync("p")
     assert out == "raw text"
 
 def test_call_ollama_sync_non_200(monkeypatch):
     def fake_post(url, json, headers, timeout):
         return DummyResp(status_code=500, json_data=None, text_data="server err")
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(client._session, "post", fake_post)
     with pytest.raises(RuntimeError):
         call_ollama_sync("p")
+
+def test_session_retries_server_errors_on_post():
+    retry = client._session.get_adapter("http://localhost").max_retries
+    assert 503 in retry.status_forcelist
+    assert "POST" in retry.allowed_methods
+    assert retry.raise_on_status is False
+
+def _mock_async_client(monkeypatch, handler):
+    mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(client, "_get_async_client", lambda: mock)
+
+def test_call_ollama_async_prefers_response_field(monkeypatch):
+    def handler(request):
+        assert b'"stream":false' in request.content.replace(b" ", b"")
+        return httpx.Response(200, json={"response": "async output"})
+    _mock_async_client(monkeypatch, handler)
+    assert asyncio.run(call_ollama_async("prompt")) == "async output"
+
+def test_call_ollama_async_client_error_not_retried(monkeypatch):
+    calls = []
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404, text="model not found")
+    _mock_async_client(monkeypatch, handler)
+    with pytest.raises(RuntimeError):
+        asyncio.run(call_ollama_async("p"))
+    assert len(calls) == 1
+
+def test_async_client_per_event_loop():
+    async def get_twice():
+        return client._get_async_client(), client._get_async_client()
+    first, again = asyncio.run(get_twice())
+    assert first is again
+    second, _ = asyncio.run(get_twice())
+    assert second is not first
+
+def test_call_ollama_async_uses_given_client():
+    mock = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"response": "own client"}))
+    )
+    for _ in range(2):
+        assert asyncio.run(call_ollama_async("p", client=mock)) == "own client"
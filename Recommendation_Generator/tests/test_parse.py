@@ -1,4 +1,4 @@
-from recommender.parse import parse_recommendations
+from recommender.parse import Rec, parse_recommendations
 
 def test_parse_numbered_lines():
     text = """1. Some Show — Great ensemble and pacing.
@@ -6,8 +6,8 @@ def test_parse_numbered_lines():
 3. ShortTitle — Compelling lead."""
     recs = parse_recommendations(text, expected=3)
     assert len(recs) == 3
-    assert recs[0]["title"] == "Some Show"
-    assert "ensemble" in recs[0]["reason"]
+    assert recs[0].title == "Some Show"
+    assert "ensemble" in recs[0].reason
 
 def test_parse_various_separators_and_dedup():
     text = """
@@ -17,9 +17,50 @@ Some Show - A reason.
 """
     recs = parse_recommendations(text, expected=3)
     assert len(recs) >= 2
-    titles = [r["title"].lower() for r in recs]
+    titles = [r.title.lower() for r in recs]
     assert titles.count("some show") == 1
+    assert [r.key for r in recs] == titles
     assert "other show" in titles
 
 def test_parse_empty_text_returns_empty_list():
     assert parse_recommendations("", expected=5) == []
+
+def test_line_regex_is_linear_on_long_whitespace_runs():
+    import re
+    import time
+    from recommender import parse
+
+    # Checked against the stdlib engine, which is used when re2 is absent
+    pattern = re.compile(parse._LINE_RE.pattern)
+    for line in ("a" + " " * 50000 + "b -", " " * 50000 + "-", "1." + " \t" * 25000 + "x -"):
+        start = time.perf_counter()
+        list(pattern.finditer(line))
+        assert time.perf_counter() - start < 1.0
+
+def test_parse_stops_at_expected_unique_titles():
+    text = "1. Alpha — x\n2. ALPHA — dup\n3. Beta — y\n4. Gamma — z\n"
+    recs = parse_recommendations(text, expected=2)
+    assert [r.title for r in recs] == ["Alpha", "Beta"]
+
+def test_parse_batch_keeps_results_per_text():
+    from recommender.parse import parse_recommendations_batch
+
+    texts = ["1. Alpha — x\n2. Beta — y", "", "1. Alpha — again"]
+    batch = parse_recommendations_batch(texts, expected=5)
+    assert batch == [parse_recommendations(t, expected=5) for t in texts]
+    assert [len(recs) for recs in batch] == [2, 0, 1]
+
+def test_parse_cache_returns_independent_results():
+    text = "1. Alpha — x\n2. Beta — y"
+    first = parse_recommendations(text, expected=5)
+    first.pop()
+    recs = parse_recommendations(text, expected=5)
+    assert recs == [Rec("Alpha", "x", "alpha"), Rec("Beta", "y", "beta")]
+
+def test_dumps_recommendations_uses_parallel_arrays():
+    import orjson
+    from recommender.parse import dumps_recommendations
+
+    recs = parse_recommendations("1. Alpha — x\n2. Beta", expected=5)
+    assert orjson.loads(dumps_recommendations(recs)) == {"titles": ["Alpha", "Beta"], "reasons": ["x", ""]}
+    assert orjson.loads(dumps_recommendations([])) == {"titles": [], "reasons": []}
@@ -15,3 +15,11 @@ def test_validate_and_clean_likes_errors():
         LikesPayload.model_validate({"likes": ["", "OK"]})
     with pytest.raises(ValidationError):
         LikesPayload.model_validate({"likes": [123]})
+
+def test_decode_likes_matches_model_validation():
+    from recommender.schemas import decode_likes
+
+    assert decode_likes(b'{"likes": [" A ", "B", "a"]}') == ["A", "B"]
+    for raw in (b'{"likes": []}', b'{"likes": ["  "]}', b'{"likes": [1]}', b"not json"):
+        with pytest.raises(ValidationError):
+            decode_likes(raw)
@@ -0,0 +1,66 @@
+from recommender.semcache import SemanticCache, cache_key
+
+def fake_embed(text):
+    # Bag-of-letters vector: identical for the same set of titles
+    vec = [0.0] * 26
+    for ch in text:
+        if "a" <= ch <= "z":
+            vec[ord(ch) - ord("a")] += 1.0
+    return vec
+
+RECS = [{"title": "Cowboy Bebop", "reason": "Stylish and melancholy."}]
+
+def make_cache(tmp_path, **kwargs):
+    return SemanticCache(str(tmp_path / "cache.db"), embed=fake_embed, model="m1", **kwargs)
+
+def test_cache_key_ignores_order_and_case():
+    assert cache_key(["Naruto", " bleach"]) == cache_key(["BLEACH", "naruto"])
+
+def test_hit_for_reordered_likes(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(["Naruto", "Bleach"], RECS)
+    assert cache.get(["bleach", "NARUTO"]) == RECS
+
+def test_miss_for_dissimilar_likes(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(["Naruto", "Bleach"], RECS)
+    assert cache.get(["xyz"]) is None
+
+def test_entries_are_namespaced_by_model(tmp_path):
+    make_cache(tmp_path).put(["Naruto"], RECS)
+    other = SemanticCache(str(tmp_path / "cache.db"), embed=fake_embed, model="m2")
+    assert other.get(["Naruto"]) is None
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = make_cache(tmp_path, ttl_s=-1)
+    cache.put(["Naruto"], RECS)
+    assert cache.get(["Naruto"]) is None
+
+def test_scan_finds_entry_after_matrix_grows(tmp_path):
+    cache = make_cache(tmp_path)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    for i in range(40):
+        cache.put([letters[i % 26] * (i // 26 + 1)], [{"title": str(i), "reason": ""}])
+    assert cache.get(["q"]) == [{"title": "16", "reason": ""}]
+
+def test_entries_persist_across_instances(tmp_path):
+    make_cache(tmp_path).put(["Naruto"], RECS)
+    assert make_cache(tmp_path).get(["naruto"]) == RECS
+
+def test_other_models_do_not_crowd_out_match(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(["Naruto"], RECS)
+    other = SemanticCache(str(tmp_path / "cache.db"), embed=fake_embed, model="m2")
+    for i in range(10):
+        other.put(["Naruto"], [{"title": str(i), "reason": ""}])
+    assert cache.get(["naruto"]) == RECS
+
+def test_expired_entries_do_not_crowd_out_match(tmp_path, monkeypatch):
+    from recommender import semcache
+    cache = make_cache(tmp_path, ttl_s=50)
+    monkeypatch.setattr(semcache.time, "time", lambda: 1000.0)
+    for i in range(10):
+        cache.put(["Naruto"], [{"title": "stale", "reason": ""}])
+    monkeypatch.setattr(semcache.time, "time", lambda: 1100.0)
+    cache.put(["Naruto"], RECS)
+    assert cache.get(["naruto"]) == RECS
@@ -0,0 +1,12 @@
+import gzip
+
+from recommender.templates import render_page, render_page_gzip
+
+def test_render_page_escapes_sample():
+    page = render_page("Fleabag\n<b>")
+    assert ">Fleabag\n&lt;b&gt;</textarea>" in page
+    assert "{{ sample }}" not in page
+
+def test_render_page_gzip_matches_plain_render():
+    for sample in ("", "The Wire\nFleabag"):
+        assert gzip.decompress(render_page_gzip(sample)).decode("utf-8") == render_page(sample)
@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import font
+from tkinter import font, ttk
 
 class LifeCounterApp:
     def __init__(self, root):
@@ -8,6 +8,8 @@ class LifeCounterApp:
 
         # Scalable font
         self.default_font = font.Font(family="Helvetica", size=12)
+        self._current_size = 12
+        self._resize_after = None
         self.root.bind("<Configure>", self.resize_font)
 
         # Player states
@@ -15,8 +17,13 @@ class LifeCounterApp:
         self.has_force = [False, False]
         self.first_player = 0
 
-        # Widgets to update background
-        self.bg_widgets = []
+        # All labels and buttons share two ttk styles, so recoloring them is
+        # one style change instead of a configure call per widget. "clam"
+        # is a theme that honors custom button backgrounds on every platform
+        self.style = ttk.Style(self.root)
+        self.style.theme_use("clam")
+        self.style.configure("Player.TLabel", font=self.default_font, anchor="center")
+        self.style.configure("Player.TButton", font=self.default_font)
 
         # Configure grid weights
         for i in range(6):
@@ -29,49 +36,55 @@ class LifeCounterApp:
         self.update_background()
 
     def resize_font(self, event):
+        # Child widgets' <Configure> events bubble up to the root binding
+        if event.widget is not self.root:
+            return
         new_size = max(12, int(min(event.width, event.height) / 30))
-        self.default_font.configure(size=new_size)
+        if self._resize_after is not None:
+            self.root.after_cancel(self._resize_after)
+            self._resize_after = None
+        if new_size == self._current_size:
+            return
+        # Changing the font re-lays out every widget using it, so wait
+        # until the drag pauses instead of doing it on every pixel
+        self._resize_after = self.root.after(50, self._apply_font_size, new_size)
+
+    def _apply_font_size(self, size):
+        self._resize_after = None
+        self._current_size = size
+        self.default_font.configure(size=size)
 
     def create_widgets(self):
-        self.p1_label = tk.Label(self.root, text="Player 1", font=self.default_font)
-        self.p2_label = tk.Label(self.root, text="Player 2", font=self.default_font)
+        self.p1_label = ttk.Label(self.root, style="Player.TLabel", text="Player 1")
+        self.p2_label = ttk.Label(self.root, style="Player.TLabel", text="Player 2")
         self.p1_label.grid(row=0, column=0, columnspan=2, sticky="nsew")
         self.p2_label.grid(row=0, column=2, columnspan=2, sticky="nsew")
 
-        self.p1_life = tk.Label(self.root, text=str(self.life[0]), font=self.default_font)
-        self.p2_life = tk.Label(self.root, text=str(self.life[1]), font=self.default_font)
+        self.p1_life = ttk.Label(self.root, style="Player.TLabel", text=str(self.life[0]))
+        self.p2_life = ttk.Label(self.root, style="Player.TLabel", text=str(self.life[1]))
         self.p1_life.grid(row=1, column=0, columnspan=2, sticky="nsew")
         self.p2_life.grid(row=1, column=2, columnspan=2, sticky="nsew")
 
         self.btns = [
-            tk.Button(self.root, text="+", font=self.default_font, command=lambda: self.change_life(0, 1)),
-            tk.Button(self.root, text="-", font=self.default_font, command=lambda: self.change_life(0, -1)),
-            tk.Button(self.root, text="+", font=self.default_font, command=lambda: self.change_life(1, 1)),
-            tk.Button(self.root, text="-", font=self.default_font, command=lambda: self.change_life(1, -1)),
+            ttk.Button(self.root, style="Player.TButton", text="+", command=lambda: self.change_life(0, 1)),
+            ttk.Button(self.root, style="Player.TButton", text="-", command=lambda: self.change_life(0, -1)),
+            ttk.Button(self.root, style="Player.TButton", text="+", command=lambda: self.change_life(1, 1)),
+            ttk.Button(self.root, style="Player.TButton", text="-", command=lambda: self.change_life(1, -1)),
         ]
         for i, btn in enumerate(self.btns):
             btn.grid(row=2, column=i, sticky="nsew")
 
-        self.p1_force_btn = tk.Button(self.root, text="Force: OFF", font=self.default_font, command=lambda: self.toggle_force(0))
-        self.p2_force_btn = tk.Button(self.root, text="Force: OFF", font=self.default_font, command=lambda: self.toggle_force(1))
+        self.p1_force_btn = ttk.Button(self.root, style="Player.TButton", text="Force: OFF", command=lambda: self.toggle_force(0))
+        self.p2_force_btn = ttk.Button(self.root, style="Player.TButton", text="Force: OFF", command=lambda: self.toggle_force(1))
         self.p1_force_btn.grid(row=3, column=0, columnspan=2, sticky="nsew")
         self.p2_force_btn.grid(row=3, column=2, columnspan=2, sticky="nsew")
 
-        self.first_player_label = tk.Label(self.root, text="First Player: 1", font=self.default_font)
+        self.first_player_label = ttk.Label(self.root, style="Player.TLabel", text="First Player: 1")
         self.first_player_label.grid(row=4, column=0, columnspan=4, sticky="nsew")
 
-        self.toggle_btn = tk.Button(self.root, text="Toggle First Player", font=self.default_font, command=self.toggle_first_player)
+        self.toggle_btn = ttk.Button(self.root, style="Player.TButton", text="Toggle First Player", command=self.toggle_first_player)
         self.toggle_btn.grid(row=5, column=0, columnspan=4, sticky="nsew")
 
-        # Add widgets to background update list
-        self.bg_widgets = [
-            self.p1_label, self.p2_label,
-            self.p1_life, self.p2_life,
-            self.first_player_label,
-            self.p1_force_btn, self.p2_force_btn,
-            self.toggle_btn
-        ] + self.btns
-
     def change_life(self, player, delta):
         self.life[player] += delta
         if player == 0:
@@ -92,8 +105,8 @@ class LifeCounterApp:
     def update_background(self):
         color = "lightblue" if self.first_player == 0 else "lightcoral"
         self.root.configure(bg=color)
-        for widget in self.bg_widgets:
-            widget.configure(bg=color)
+        self.style.configure("Player.TLabel", background=color)
+        self.style.configure("Player.TButton", background=color)
 
 if __name__ == "__main__":
     root = tk.Tk()
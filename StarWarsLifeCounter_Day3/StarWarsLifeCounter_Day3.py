@@ -1,6 +1,11 @@
 import tkinter as tk
 from tkinter import font
 
+# Layout grid; every label and button is a cell on one Canvas
+ROWS = 6
+COLUMNS = 4
+BUTTON_COLOR = "lightgrey"
+
 class StarWarsLifeCounter:
     def __init__(self, root):
         self.root = root
@@ -15,85 +20,86 @@ class StarWarsLifeCounter:
         self.default_font = font.Font(family="Helvetica", size=12)
         self.large_font = font.Font(family="Helvetica", size=20, weight="bold")
 
-        # Configure grid to scale
-        for i in range(6):
-            self.root.rowconfigure(i, weight=1)
-        for j in range(4):
-            self.root.columnconfigure(j, weight=1)
+        # A single Canvas draws everything: recoloring is one itemconfig on
+        # a tag rather than a configure call (and redraw) per widget
+        self.canvas = tk.Canvas(self.root, width=480, height=360, highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.cells = []  # (rectangle id, text id, row, column, columnspan)
 
         self.create_widgets()
         self.update_colors()
 
+        # Cells scale with the window
+        self.canvas.bind("<Configure>", self.layout)
+
     def create_widgets(self):
         # Player Labels
-        self.player_labels = [
-            tk.Label(self.root, text="Player 1", font=self.large_font),
-            tk.Label(self.root, text="Player 2", font=self.large_font)
-        ]
-        self.player_labels[0].grid(row=0, column=0, columnspan=2, sticky="nsew")
-        self.player_labels[1].grid(row=0, column=2, columnspan=2, sticky="nsew")
+        self.add_cell("p1_label", "Player 1", 0, 0, 2, self.large_font, colored=True)
+        self.add_cell("p2_label", "Player 2", 0, 2, 2, self.large_font, colored=True)
 
         # Life Totals
-        self.life_labels = [
-            tk.Label(self.root, text=str(self.life[0]), font=self.large_font),
-            tk.Label(self.root, text=str(self.life[1]), font=self.large_font)
-        ]
-        self.life_labels[0].grid(row=1, column=0, columnspan=2, sticky="nsew")
-        self.life_labels[1].grid(row=1, column=2, columnspan=2, sticky="nsew")
+        self.add_cell("p1_life", str(self.life[0]), 1, 0, 2, self.large_font, colored=True)
+        self.add_cell("p2_life", str(self.life[1]), 1, 2, 2, self.large_font, colored=True)
 
         # Life Buttons
         self.create_life_buttons()
 
         # Force Toggles
-        self.force_buttons = [
-            tk.Button(self.root, text="Toggle Force P1", command=lambda: self.toggle_force(0)),
-            tk.Button(self.root, text="Toggle Force P2", command=lambda: self.toggle_force(1))
-        ]
-        self.force_buttons[0].grid(row=4, column=0, columnspan=2, sticky="nsew")
-        self.force_buttons[1].grid(row=4, column=2, columnspan=2, sticky="nsew")
+        self.add_cell("p1_force", "Toggle Force P1", 4, 0, 2, self.default_font, command=lambda: self.toggle_force(0))
+        self.add_cell("p2_force", "Toggle Force P2", 4, 2, 2, self.default_font, command=lambda: self.toggle_force(1))
 
         # First Player Indicator
-        self.first_player_label = tk.Label(self.root, text="First Player: Player 1", font=self.large_font)
-        self.first_player_label.grid(row=5, column=0, columnspan=4, sticky="nsew")
+        self.add_cell("first_player", "First Player: Player 1", 5, 0, 4, self.large_font, colored=True)
 
         # Switch First Player Button
-        self.switch_button = tk.Button(self.root, text="Switch First Player", command=self.switch_first_player)
-        self.switch_button.grid(row=3, column=1, columnspan=2, sticky="nsew")
+        self.add_cell("switch", "Switch First Player", 3, 1, 2, self.default_font, command=self.switch_first_player)
 
     def create_life_buttons(self):
         # Player 1
-        tk.Button(self.root, text="+", command=lambda: self.change_life(0, 1)).grid(row=2, column=0, sticky="nsew")
-        tk.Button(self.root, text="-", command=lambda: self.change_life(0, -1)).grid(row=2, column=1, sticky="nsew")
+        self.add_cell("p1_plus", "+", 2, 0, 1, self.default_font, command=lambda: self.change_life(0, 1))
+        self.add_cell("p1_minus", "-", 2, 1, 1, self.default_font, command=lambda: self.change_life(0, -1))
         # Player 2
-        tk.Button(self.root, text="+", command=lambda: self.change_life(1, 1)).grid(row=2, column=2, sticky="nsew")
-        tk.Button(self.root, text="-", command=lambda: self.change_life(1, -1)).grid(row=2, column=3, sticky="nsew")
+        self.add_cell("p2_plus", "+", 2, 2, 1, self.default_font, command=lambda: self.change_life(1, 1))
+        self.add_cell("p2_minus", "-", 2, 3, 1, self.default_font, command=lambda: self.change_life(1, -1))
+
+    def add_cell(self, tag, text, row, column, columnspan, cell_font, colored=False, command=None):
+        # Colored cells share the "colored" tag on their background only,
+        # so update_colors() never touches text or button colors
+        rect_tags = (tag, "colored") if colored else (tag,)
+        rect = self.canvas.create_rectangle(0, 0, 0, 0, fill=BUTTON_COLOR, outline="grey", tags=rect_tags)
+        text_id = self.canvas.create_text(0, 0, text=text, font=cell_font, tags=(tag, f"{tag}_text"))
+        self.cells.append((rect, text_id, row, column, columnspan))
+        if command is not None:
+            self.canvas.tag_bind(tag, "<Button-1>", lambda event: command())
+
+    def layout(self, event):
+        cell_w = event.width / COLUMNS
+        cell_h = event.height / ROWS
+        for rect, text_id, row, column, columnspan in self.cells:
+            x0, y0 = column * cell_w, row * cell_h
+            x1, y1 = x0 + columnspan * cell_w, y0 + cell_h
+            self.canvas.coords(rect, x0, y0, x1, y1)
+            self.canvas.coords(text_id, (x0 + x1) / 2, (y0 + y1) / 2)
 
     def change_life(self, player, delta):
         self.life[player] += delta
-        self.life_labels[player].config(text=str(self.life[player]))
+        self.canvas.itemconfig(f"p{player + 1}_life_text", text=str(self.life[player]))
 
     def toggle_force(self, player):
         self.force[player] = not self.force[player]
         status = "Has Force" if self.force[player] else "No Force"
-        self.force_buttons[player].config(text=f"{status} P{player + 1}")
+        self.canvas.itemconfig(f"p{player + 1}_force_text", text=f"{status} P{player + 1}")
 
     def switch_first_player(self):
         self.first_player = 1 - self.first_player
-        self.first_player_label.config(text=f"First Player: Player {self.first_player + 1}")
+        self.canvas.itemconfig("first_player_text", text=f"First Player: Player {self.first_player + 1}")
         self.update_colors()
 
     def update_colors(self):
+        # Player labels, life totals and the first player label; the
+        # buttons keep their default grey
         color = "blue" if self.first_player == 0 else "red"
-        self.player_labels[0].config(bg=color)
-        self.player_labels[1].config(bg=color)
-        self.life_labels[0].config(bg=color)
-        self.life_labels[1].config(bg=color)
-        self.first_player_label.config(bg=color)
-
-        # Reset other buttons to default grey
-        for btn in self.force_buttons:
-            btn.config(bg="lightgrey")
-        self.switch_button.config(bg="lightgrey")
+        self.canvas.itemconfig("colored", fill=color)
 
 # Run the app
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
-from flask import Flask, render_template, request, redirect, url_for
+import threading
+
+from flask import Flask, render_template, request, redirect, url_for, jsonify
 
 app = Flask(__name__)
 
@@ -10,12 +12,12 @@ game_state = {
     "player1_force": False,
     "player2_force": False
 }
+# Requests are served on several threads; clicks must not interleave updates
+state_lock = threading.Lock()
 
-@app.route("/", methods=["GET", "POST"])
-def index():
-    if request.method == "POST":
-        action = request.form.get("action")
-
+def apply_action(action):
+    """Apply one button action and return a snapshot of the new state"""
+    with state_lock:
         if action == "p1_inc":
             game_state["player1_life"] += 1
         elif action == "p1_dec":
@@ -30,10 +32,22 @@ def index():
             game_state["player1_force"] = not game_state["player1_force"]
         elif action == "toggle_force_p2":
             game_state["player2_force"] = not game_state["player2_force"]
+        return dict(game_state)
 
+@app.route("/", methods=["GET", "POST"])
+def index():
+    # Plain form posts still work when JavaScript is off
+    if request.method == "POST":
+        apply_action(request.form.get("action"))
         return redirect(url_for("index"))
 
     return render_template("index.html", state=game_state)
 
+@app.route("/api/action", methods=["POST"])
+def api_action():
+    # The page posts here with fetch and updates itself from the JSON,
+    # avoiding the redirect and a full re-render per click
+    return jsonify(apply_action(request.form.get("action")))
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
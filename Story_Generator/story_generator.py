@@ -16,19 +16,26 @@ Requirements:
 - ollama
 - tkinter
 - pyperclip
+- diskcache (optional, persists LLM responses between runs)
 """
 
 import os
 import sys
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any
+import re
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import chromadb
 from chromadb import Client
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableSequence
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
 from langchain_chroma import Chroma
@@ -38,6 +45,11 @@ import tkinter as tk
 from tkinter import scrolledtext, messagebox
 import pyperclip
 
+try:
+    import diskcache
+except ImportError:  # optional: responses are then cached for this run only
+    diskcache = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -49,6 +61,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Queued words are embedded once this many are pending
+EMBED_BATCH = 256
+
 @dataclass
 class StoryGenerationConfig:
     """Configuration for story generation"""
@@ -57,6 +72,74 @@ class StoryGenerationConfig:
     chroma_persist_directory: str = "./chroma_db"
     max_tokens: int = 2048
     temperature: float = 0.7
+    cache_directory: Optional[str] = "./story_cache"
+    # How long Ollama keeps the model loaded between the writer and editor calls
+    keep_alive: str = "10m"
+    history_size: int = 100
+    # Responses kept in memory; older ones are still found on disk
+    memory_cache_size: int = 512
+    # Skip the editor LLM call when needs_editing() finds nothing to fix
+    local_precheck: bool = True
+
+def build_llm(config: StoryGenerationConfig) -> ChatOllama:
+    """Create the Ollama chat model both agents talk to"""
+    return ChatOllama(
+        model=config.ollama_model,
+        temperature=config.temperature,
+        num_predict=config.max_tokens,
+        keep_alive=config.keep_alive
+    )
+
+class ResponseCache:
+    """Caches LLM outputs by a hash of the prompt inputs and model settings"""
+    
+    def __init__(self, directory: Optional[str] = None, maxsize: int = 512):
+        # Least recently used first; evicted past maxsize
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._maxsize = maxsize
+        self._disk = diskcache.Cache(directory) if directory and diskcache else None
+    
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Stable key for a sequence of prompt inputs"""
+        return hashlib.sha256("\0".join(map(str, parts)).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        elif self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                self._remember(key, value)
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        self._remember(key, value)
+        if self._disk is not None:
+            self._disk.set(key, value)
+    
+    def _remember(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._maxsize:
+            self._memory.popitem(last=False)
+
+# Double spaces, a lowercase "i", a sentence starting lowercase, or a space
+# before punctuation
+_SUSPECT_RE = re.compile(r"[ \t]{2,}|\bi\b|[.!?][ \t]+[a-z]|[ \t][,.;:!?]")
+
+@lru_cache(maxsize=256)
+def needs_editing(story: str) -> bool:
+    """
+    Cheap local grammar screen for a story
+    
+    Returns False only when nothing looks off, in which case the editor's
+    LLM round trip can be skipped. Anything too short to judge is edited.
+    """
+    if story.count(".") < 3 or story[:1].islower():
+        return True
+    return _SUSPECT_RE.search(story) is not None
 
 class WordVectorizer:
     """Handles vectorization of words using ChromaDB"""
@@ -68,19 +151,34 @@ class WordVectorizer:
             name=config.chroma_collection_name,
             metadata={"hnsw:space": "cosine"}
         )
+        # Insertion-ordered set of words waiting to be embedded
+        self._pending: Dict[str, None] = {}
         logger.info("Word vectorizer initialized")
     
-    def add_words(self, words: List[str]) -> None:
-        """Add words to the vector store"""
+    def add_words(self, words: List[str], flush: bool = True) -> None:
+        """
+        Add words to the vector store
+        
+        With flush=False, words are queued and only embedded once
+        EMBED_BATCH of them are pending, or on the next flush() or search.
+        """
+        self._pending.update(dict.fromkeys(words))
+        if flush or len(self._pending) >= EMBED_BATCH:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Embed and store all queued words"""
+        if not self._pending:
+            return
+        words = list(self._pending)
         try:
-            # Create documents from words
-            documents = [Document(page_content=word) for word in words]
-            
-            # Add to ChromaDB
-            self.collection.add(
+            # IDs derived from the word make re-adding a word an idempotent
+            # upsert instead of overwriting whatever sat at index "0"
+            self.collection.upsert(
                 documents=words,
-                ids=[str(i) for i in range(len(words))]
+                ids=[hashlib.blake2b(w.encode("utf-8"), digest_size=8).hexdigest() for w in words]
             )
+            self._pending.clear()
             logger.info(f"Added {len(words)} words to vector store")
         except Exception as e:
             logger.error(f"Error adding words to vector store: {e}")
@@ -89,6 +187,7 @@ class WordVectorizer:
     def search_words(self, query: str, n_results: int = 5) -> List[str]:
         """Search for similar words"""
         try:
+            self.flush()
             results = self.collection.query(
                 query_texts=[query],
                 n_results=n_results
@@ -101,13 +200,15 @@ class WordVectorizer:
 class WriterAgent:
     """Agent that generates stories from a list of words"""
     
-    def __init__(self, config: StoryGenerationConfig):
+    def __init__(
+        self,
+        config: StoryGenerationConfig,
+        cache: Optional[ResponseCache] = None,
+        llm: Optional[ChatOllama] = None
+    ):
         self.config = config
-        self.llm = ChatOllama(
-            model=config.ollama_model,
-            temperature=config.temperature,
-            num_predict=config.max_tokens
-        )
+        self.cache = cache or ResponseCache()
+        self.llm = llm or build_llm(config)
         
         # Prompt template for story generation
         self.prompt_template = PromptTemplate.from_template(
@@ -121,24 +222,52 @@ class WriterAgent:
             """
         )
         
-        self.chain = RunnableSequence(
-            steps=[
-                self.prompt_template,
-                self.llm,
-                StrOutputParser()
-            ]
-        )
+        self.chain = self.prompt_template | self.llm | StrOutputParser()
         logger.info("Writer agent initialized")
     
+    def _cache_key(self, words_str: str, instructions: str) -> str:
+        return self.cache.key(
+            "writer", self.config.ollama_model, self.config.temperature,
+            self.config.max_tokens, words_str, instructions
+        )
+    
     def generate_story(self, words: List[str], instructions: str = "") -> str:
         """Generate a story from the given words"""
         try:
             words_str = ", ".join(words)
+            key = self._cache_key(words_str, instructions)
+            result = self.cache.get(key)
+            if result is not None:
+                logger.info("Story served from cache")
+                return result
+            
             result = self.chain.invoke({
                 "words": words_str,
                 "instructions": instructions
             })
-            logger.info("Story generated successfully")
+            self.cache.set(key, result)
+            logger.info("Story generated successfully (cache miss)")
+            return result
+        except Exception as e:
+            logger.error(f"Error generating story: {e}")
+            raise
+    
+    async def agenerate_story(self, words: List[str], instructions: str = "") -> str:
+        """Async version of generate_story, using the chain's native ainvoke"""
+        try:
+            words_str = ", ".join(words)
+            key = self._cache_key(words_str, instructions)
+            result = self.cache.get(key)
+            if result is not None:
+                logger.info("Story served from cache")
+                return result
+            
+            result = await self.chain.ainvoke({
+                "words": words_str,
+                "instructions": instructions
+            })
+            self.cache.set(key, result)
+            logger.info("Story generated successfully (cache miss)")
             return result
         except Exception as e:
             logger.error(f"Error generating story: {e}")
@@ -147,13 +276,15 @@ class WriterAgent:
 class EditorAgent:
     """Agent that checks for grammatical errors in stories"""
     
-    def __init__(self, config: StoryGenerationConfig):
+    def __init__(
+        self,
+        config: StoryGenerationConfig,
+        cache: Optional[ResponseCache] = None,
+        llm: Optional[ChatOllama] = None
+    ):
         self.config = config
-        self.llm = ChatOllama(
-            model=config.ollama_model,
-            temperature=config.temperature,
-            num_predict=config.max_tokens
-        )
+        self.cache = cache or ResponseCache()
+        self.llm = llm or build_llm(config)
         
         # Prompt template for grammar checking
         self.prompt_template = PromptTemplate.from_template(
@@ -167,26 +298,55 @@ class EditorAgent:
             """
         )
         
-        self.chain = RunnableSequence(
-            steps=[
-                self.prompt_template,
-                self.llm,
-                StrOutputParser()
-            ]
-        )
+        self.chain = self.prompt_template | self.llm | StrOutputParser()
         logger.info("Editor agent initialized")
     
+    def _cache_key(self, story: str) -> str:
+        return self.cache.key(
+            "editor", self.config.ollama_model, self.config.temperature,
+            self.config.max_tokens, story
+        )
+    
+    @staticmethod
+    def _verdict(story: str, result: str) -> Dict[str, Any]:
+        """Turn the editor's reply into has_errors and the corrected story"""
+        if "No errors found" in result.lower():
+            return {"has_errors": False, "correction": story}
+        else:
+            return {"has_errors": True, "correction": result}
+    
     def check_story(self, story: str) -> Dict[str, Any]:
         """Check story for errors and return corrections"""
         try:
-            result = self.chain.invoke({"story": story})
-            logger.info("Story checked for errors")
+            key = self._cache_key(story)
+            result = self.cache.get(key)
+            if result is not None:
+                logger.info("Story check served from cache")
+            else:
+                result = self.chain.invoke({"story": story})
+                self.cache.set(key, result)
+                logger.info("Story checked for errors (cache miss)")
             
             # Determine if there were errors
-            if "No errors found" in result.lower():
-                return {"has_errors": False, "correction": story}
+            return self._verdict(story, result)
+        except Exception as e:
+            logger.error(f"Error checking story: {e}")
+            raise
+    
+    async def acheck_story(self, story: str) -> Dict[str, Any]:
+        """Async version of check_story, using the chain's native ainvoke"""
+        try:
+            key = self._cache_key(story)
+            result = self.cache.get(key)
+            if result is not None:
+                logger.info("Story check served from cache")
             else:
-                return {"has_errors": True, "correction": result}
+                result = await self.chain.ainvoke({"story": story})
+                self.cache.set(key, result)
+                logger.info("Story checked for errors (cache miss)")
+            
+            # Determine if there were errors
+            return self._verdict(story, result)
         except Exception as e:
             logger.error(f"Error checking story: {e}")
             raise
@@ -194,14 +354,30 @@ class EditorAgent:
 class StoryGenerator:
     """Main story generation workflow"""
     
-    def __init__(self, config: StoryGenerationConfig = None):
+    def __init__(self, config: Optional[StoryGenerationConfig] = None):
         self.config = config or StoryGenerationConfig()
         self.vectorizer = WordVectorizer(self.config)
-        self.writer = WriterAgent(self.config)
-        self.editor = EditorAgent(self.config)
-        self.history = []
+        # One cache for both agents, so repeated runs skip both LLM calls
+        self.cache = ResponseCache(self.config.cache_directory, self.config.memory_cache_size)
+        # One client for both agents. generate_story makes both calls through
+        # its sync HTTP pool and agenerate_story both through its async pool,
+        # so the editor reuses the writer's connection either way
+        self.llm = build_llm(self.config)
+        self.writer = WriterAgent(self.config, self.cache, self.llm)
+        self.editor = EditorAgent(self.config, self.cache, self.llm)
+        # Bounded, so a long session doesn't keep every draft in memory
+        self.history = deque(maxlen=self.config.history_size)
+        self._stories = 0
+        self._editor_skips = 0
         logger.info("Story generator initialized")
     
+    def history_log(self) -> List[Dict[str, Any]]:
+        """History entries with their timestamps converted to datetimes"""
+        return [
+            {**entry, "timestamp": datetime.fromtimestamp(entry["timestamp"])}
+            for entry in self.history
+        ]
+    
     def process_words(self, words: List[str]) -> None:
         """Process a list of words for story generation"""
         try:
@@ -212,35 +388,83 @@ class StoryGenerator:
             raise
     
     def generate_story(self, words: List[str], instructions: str = "") -> str:
-        """Generate a story from words with optional instructions"""
+        """
+        Generate a story from words with optional instructions
+        
+        Only the editor depends on the writer's output, so the ChromaDB
+        insert runs on a worker thread while the writer waits on Ollama.
+        Everything else stays synchronous: a fresh event loop per call
+        would leave ChatOllama's async client bound to a closed loop.
+        """
         try:
-            # Generate initial story
-            story = self.writer.generate_story(words, instructions)
+            # Generate initial story while the words are indexed
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                indexing = pool.submit(self.process_words, words)
+                story = self.writer.generate_story(words, instructions)
+                indexing.result()
             
-            # Add to history
-            self.history.append({
-                "step": "initial",
-                "story": story,
-                "timestamp": datetime.now()
-            })
+            if not self._record_initial(story):
+                return story
             
             # Check for errors
-            check_result = self.editor.check_story(story)
+            return self._apply_check(story, self.editor.check_story(story))
+        except Exception as e:
+            logger.error(f"Error in story generation: {e}")
+            raise
+    
+    async def agenerate_story(self, words: List[str], instructions: str = "") -> str:
+        """
+        Async version of generate_story, for callers with a running event loop
+        
+        The writer's ainvoke and the ChromaDB insert (in a worker thread)
+        run concurrently; the editor then uses ainvoke as well.
+        """
+        try:
+            # Generate initial story while the words are indexed
+            story, _ = await asyncio.gather(
+                self.writer.agenerate_story(words, instructions),
+                asyncio.to_thread(self.process_words, words)
+            )
             
-            # If errors found, apply correction
-            if check_result["has_errors"]:
-                corrected_story = check_result["correction"]
-                self.history.append({
-                    "step": "corrected",
-                    "story": corrected_story,
-                    "timestamp": datetime.now()
-                })
-                return corrected_story
-            else:
+            if not self._record_initial(story):
                 return story
+            
+            # Check for errors
+            return self._apply_check(story, await self.editor.acheck_story(story))
         except Exception as e:
             logger.error(f"Error in story generation: {e}")
             raise
+    
+    def _record_initial(self, story: str) -> bool:
+        """Add the writer's story to history; False when it can skip the editor"""
+        self.history.append({
+            "step": "initial",
+            "story": story,
+            "timestamp": time.time()
+        })
+        
+        # Stories that pass the local screen skip the editor entirely
+        self._stories += 1
+        if self.config.local_precheck and not needs_editing(story):
+            self._editor_skips += 1
+            logger.info(
+                f"Editor skipped by local check ({self._editor_skips}/{self._stories} stories)"
+            )
+            return False
+        return True
+    
+    def _apply_check(self, story: str, check_result: Dict[str, Any]) -> str:
+        """Return the editor's correction (recorded in history), or the story"""
+        if check_result["has_errors"]:
+            corrected_story = check_result["correction"]
+            self.history.append({
+                "step": "corrected",
+                "story": corrected_story,
+                "timestamp": time.time()
+            })
+            return corrected_story
+        else:
+            return story
 
 class StoryPublisher:
     """Handles publishing the final story to a GUI"""
@@ -319,10 +543,7 @@ def main():
     # Example words for story generation
     words = ["dragon", "castle", "knight", "magic", "quest", "treasure", "princess"]
     
-    # Process words
-    generator.process_words(words)
-    
-    # Generate story with instructions
+    # Generate story with instructions (the words are indexed alongside)
     instructions = "Create a fantasy story about a brave knight on a quest to save a princess from a dragon."
     story = generator.generate_story(words, instructions)
     
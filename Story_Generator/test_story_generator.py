@@ -6,6 +6,10 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add the script directory to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,9 +19,41 @@ from story_generator import (
     WordVectorizer,
     WriterAgent,
     EditorAgent,
-    StoryGenerator
+    StoryGenerator,
+    ResponseCache,
+    needs_editing
 )
 
+STORY = "The knight rode out. The dragon woke. The castle burned. They won."
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Answers /api/chat with a single streamed message"""
+    
+    # Keep-alive, like Ollama, so clients pool the connection
+    protocol_version = "HTTP/1.1"
+    
+    # Client ports of the requests served, to tell connections apart
+    ports = []
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.ports.append(self.client_address[1])
+        body = json.dumps({
+            "model": "llama3.2",
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": STORY},
+            "done": True,
+            "done_reason": "stop"
+        }).encode("utf-8") + b"\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
 class TestStoryGenerator(unittest.TestCase):
     """Test cases for story generator components"""
     
@@ -53,7 +89,24 @@ class TestStoryGenerator(unittest.TestCase):
         vectorizer = WordVectorizer(self.config)
         vectorizer.add_words(self.test_words)
         
-        mock_collection.add.assert_called_once()
+        mock_collection.upsert.assert_called_once()
+    
+    @patch('chromadb.PersistentClient')
+    def test_add_words_batches_until_flush(self, mock_client):
+        """Test queued words are embedded once, with stable IDs"""
+        mock_collection = MagicMock()
+        mock_client.return_value.get_or_create_collection.return_value = mock_collection
+        
+        vectorizer = WordVectorizer(self.config)
+        vectorizer.add_words(["dragon", "castle"], flush=False)
+        vectorizer.add_words(["castle", "knight"], flush=False)
+        mock_collection.upsert.assert_not_called()
+        
+        vectorizer.flush()
+        mock_collection.upsert.assert_called_once()
+        kwargs = mock_collection.upsert.call_args.kwargs
+        self.assertEqual(kwargs["documents"], ["dragon", "castle", "knight"])
+        self.assertEqual(len(set(kwargs["ids"])), 3)
     
     @patch('chromadb.PersistentClient')
     def test_search_words(self, mock_client):
@@ -104,6 +157,77 @@ class TestStoryGenerator(unittest.TestCase):
         
         self.assertIsInstance(story, str)
         self.assertTrue(len(story) > 0)
+    
+    @patch('chromadb.PersistentClient')
+    def test_generate_story_twice(self, mock_client):
+        """Test repeated generate_story calls reuse the Ollama client"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        
+        # No cache, so both calls go to the server
+        config = StoryGenerationConfig(cache_directory=None)
+        with patch.dict(os.environ, {"OLLAMA_HOST": f"127.0.0.1:{server.server_port}"}):
+            generator = StoryGenerator(config)
+        
+        self.assertEqual(generator.generate_story(["dragon"]), STORY)
+        self.assertEqual(generator.generate_story(["castle"]), STORY)
+    
+    @patch('chromadb.PersistentClient')
+    def test_editor_reuses_writer_connection(self, mock_client):
+        """Test writer and editor calls share one pooled connection"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        
+        # Always run the editor, and never answer from the cache
+        config = StoryGenerationConfig(cache_directory=None, local_precheck=False)
+        runs = [
+            lambda generator: generator.generate_story(["dragon"]),
+            lambda generator: asyncio.run(generator.agenerate_story(["dragon"]))
+        ]
+        for run in runs:
+            with patch.dict(os.environ, {"OLLAMA_HOST": f"127.0.0.1:{server.server_port}"}):
+                generator = StoryGenerator(config)
+            FakeOllamaHandler.ports = []
+            run(generator)
+            self.assertEqual(len(FakeOllamaHandler.ports), 2)
+            self.assertEqual(len(set(FakeOllamaHandler.ports)), 1)
+    
+    def test_response_cache(self):
+        """Test response cache keys and lookups"""
+        cache = ResponseCache()
+        key = cache.key("writer", "llama3.2", 0.7, "dragon, castle", "")
+        
+        self.assertEqual(key, cache.key("writer", "llama3.2", 0.7, "dragon, castle", ""))
+        self.assertNotEqual(key, cache.key("writer", "llama3.2", 0.2, "dragon, castle", ""))
+        self.assertIsNone(cache.get(key))
+        
+        cache.set(key, "Once upon a time")
+        self.assertEqual(cache.get(key), "Once upon a time")
+    
+    def test_response_cache_is_bounded(self):
+        """Test the in-memory layer evicts the least recently used entry"""
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        self.assertEqual(cache.get("a"), "1")
+        cache.set("c", "3")
+        
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.get("c"), "3")
+    
+    def test_needs_editing(self):
+        """Test the local grammar screen"""
+        clean = "The knight rode out. The dragon woke. The castle burned. They won."
+        self.assertFalse(needs_editing(clean))
+        self.assertTrue(needs_editing("Too short."))
+        self.assertTrue(needs_editing(clean.replace("The dragon", "the dragon")))
+        self.assertTrue(needs_editing(clean.replace("rode out", "rode  out")))
+        self.assertTrue(needs_editing(clean + " Then i slept."))
 
 if __name__ == '__main__':
     unittest.main()
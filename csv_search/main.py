@@ -2,18 +2,25 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
 import os
-import glob
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+
+# Compiled by `python setup.py build_ext --inplace` when Cython is available;
+# the plain module is imported otherwise
+from scan import scan_file
 
 # Constants
 CSV_DIRECTORY = '' # 🔁 Change this to your actual directory
 CHUNK_SIZE = 100_000  # Adjust based on available memory
+POLL_MS = 50  # How often the GUI checks on running file scans
+INSERT_BATCH = 500  # Result rows added to the table per idle callback
 
 # GUI Application
 class CSVSearcher(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("CSV Search Tool")
-        self.geometry("400x250")
+        self.geometry("400x280")
         #self.create_widgets()
 
 #    def create_widgets(self):
@@ -31,9 +38,13 @@ class CSVSearcher(tk.Tk):
         self.search_str_entry.pack()
 
         # Search button
-        ttk.Button(self, text="Search", command=self.search_files).pack(pady=15)
+        self.search_button = ttk.Button(self, text="Search", command=self.search_files)
+        self.search_button.pack(pady=15)
+
+        self.progress = ttk.Progressbar(self, length=300, mode="determinate")
+        self.progress.pack()
 
-    def search_files(self):
+    def search_files(self) -> None:
         file_id = self.file_id_entry.get().strip()
         search_col = self.search_col_entry.get().strip()
         search_str = self.search_str_entry.get().strip()
@@ -42,43 +53,85 @@ class CSVSearcher(tk.Tk):
             messagebox.showerror("Input Error", "Please fill in all fields.")
             return
 
-        pattern = os.path.join(CSV_DIRECTORY, f"*{file_id}*.csv")
-        matching_files = glob.glob(pattern)
+        # One streamed directory read; DirEntry answers is_file() from the
+        # listing itself on most platforms, without a stat per entry
+        with os.scandir(CSV_DIRECTORY or ".") as entries:
+            matching_files = [
+                entry.path for entry in entries
+                if entry.name.endswith(".csv") and file_id in entry.name
+                and not entry.name.startswith(".") and entry.is_file()
+            ]
         if not matching_files:
             messagebox.showinfo("No Files Found", "No matching files were found.")
             return
 
-        matched_rows = []
-        for file_path in matching_files:
+        # Files are scanned in parallel worker processes; the GUI polls for
+        # finished scans instead of blocking until all of them are done
+        needle = search_str.lower()
+        executor = ProcessPoolExecutor(max_workers=min(len(matching_files), os.cpu_count() or 1))
+        futures = [(executor.submit(scan_file, path, search_col, needle, CHUNK_SIZE), path) for path in matching_files]
+        executor.shutdown(wait=False)
+
+        self.search_button.state(["disabled"])
+        self.progress.configure(maximum=len(futures), value=0)
+        self.after(POLL_MS, self._poll_scans, futures, [])
+
+    def _poll_scans(self, futures: List[Tuple[Future, str]], matched_rows: List[pd.DataFrame]) -> None:
+        pending = []
+        for future, file_path in futures:
+            if not future.done():
+                pending.append((future, file_path))
+                continue
             try:
-                for chunk in pd.read_csv(file_path, chunksize=CHUNK_SIZE):
-                    if search_col not in chunk.columns:
-                        continue
-                    chunk['__source_file__'] = os.path.basename(file_path)  # Add file name as new column
-                    results = chunk[chunk[search_col].astype(str).str.lower() == search_str.lower()]
-                    if not results.empty:
-                        matched_rows.append(results)
+                results = future.result()
             except Exception as e:
                 messagebox.showerror("Processing Error", f"Error reading {file_path}:\n{str(e)}")
+            else:
+                if results is not None:
+                    matched_rows.append(results)
+            self.progress["value"] += 1
+
+        if pending:
+            self.after(POLL_MS, self._poll_scans, pending, matched_rows)
+            return
 
+        self.search_button.state(["!disabled"])
         if matched_rows:
             self.show_results(pd.concat(matched_rows, ignore_index=True))
         else:
             messagebox.showinfo("No Matches", "No rows matched the given criteria.")
 
-    def show_results(self, dataframe):
+    def show_results(self, dataframe: pd.DataFrame) -> None:
         result_window = tk.Toplevel(self)
         result_window.title("Search Results")
+        # Keep the window hidden, and the tree unmapped, while it fills so
+        # Tk doesn't redraw per row
+        result_window.withdraw()
         tree = ttk.Treeview(result_window)
-        tree.pack(fill='both', expand=True)
 
-        tree["columns"] = list(dataframe.columns)
+        columns = list(dataframe.columns)
+        tree["columns"] = columns
         tree["show"] = "headings"
-        for col in dataframe.columns:
+        for col in columns:
             tree.heading(col, text=col)
 
-        for _, row in dataframe.iterrows():
-            tree.insert("", "end", values=list(row))
+        # Plain tuples; iterrows() would build a Series for every row
+        rows = dataframe.itertuples(index=False, name=None)
+        self.after_idle(self._fill_results, result_window, tree, rows)
+
+    def _fill_results(self, result_window: tk.Toplevel, tree: ttk.Treeview, rows: Iterator[tuple]) -> None:
+        # Insert in batches between idle callbacks so the main window keeps
+        # handling events while a large result set loads
+        inserted = 0
+        for row in rows:
+            tree.insert("", "end", values=row)
+            inserted += 1
+            if inserted == INSERT_BATCH:
+                self.after_idle(self._fill_results, result_window, tree, rows)
+                return
+
+        tree.pack(fill='both', expand=True)
+        result_window.deiconify()
 
 # Run App
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Per-file CSV scan used by the search workers
+
+Kept apart from the GUI so setup.py can compile it with Cython; the
+skiprows callback below runs once per line of every file with hits.
+"""
+import os
+from typing import Optional, Set
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+    SEARCH_DTYPE = "string[pyarrow]"
+except ImportError:
+    pa = None
+    SEARCH_DTYPE = "string"
+
+ARROW_BLOCK_SIZE = 8 << 20  # Bytes of CSV per Arrow record batch
+
+
+def scan_file(file_path: str, search_col: str, needle: str, chunksize: int) -> Optional[pd.DataFrame]:
+    """
+    Return the rows of one CSV whose search column equals `needle`
+    (already lowercased), or None when nothing matches
+
+    Runs in a worker process, so it must stay a top-level function.
+    """
+    # A header-only read skips files without the column outright
+    if search_col not in pd.read_csv(file_path, nrows=0).columns:
+        return None
+
+    # First pass parses only the search column, second pass parses full
+    # rows, but only the matching ones
+    hits = find_hits(file_path, search_col, needle, chunksize)
+    if not hits:
+        return None
+
+    # Row 0 is the header, data row i is row i + 1. skiprows numbers
+    # records (a quoted newline stays in its row) but counts blank lines,
+    # so find_hits numbers rows the same way
+    results = pd.read_csv(file_path, skiprows=lambda i: i != 0 and i - 1 not in hits,
+                          dtype={search_col: SEARCH_DTYPE})
+    results['__source_file__'] = os.path.basename(file_path)  # Add file name as new column
+    return results
+
+
+def find_hits(file_path: str, search_col: str, needle: str, chunksize: int) -> Set[int]:
+    """
+    Return the data row numbers whose search column equals `needle`
+
+    Blank lines count as (never matching) rows, as in scan_file's skiprows.
+    """
+    if pa is None:
+        # Reading the column as strings skips astype(str) per chunk
+        hits = set()
+        for chunk in pd.read_csv(file_path, usecols=[search_col], chunksize=chunksize,
+                                 dtype={search_col: SEARCH_DTYPE}, skip_blank_lines=False):
+            mask = chunk[search_col].str.lower().eq(needle).fillna(False)
+            hits.update(chunk.index[mask])
+        return hits
+
+    # Arrow streams the column into dictionary-encoded batches, so each
+    # distinct value is lowercased and compared once and rows are matched
+    # by their integer dictionary index
+    reader = pacsv.open_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+        # Blank lines become empty rows, keeping offsets in step with skiprows
+        parse_options=pacsv.ParseOptions(newlines_in_values=True, ignore_empty_lines=False),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[search_col],
+            column_types={search_col: pa.dictionary(pa.int32(), pa.string())},
+        ),
+    )
+    hits = set()
+    offset = 0
+    for batch in reader:
+        column = batch.column(0)
+        matches = pc.equal(pc.utf8_lower(column.dictionary), needle)
+        mask = pc.take(matches, column.indices).fill_null(False)
+        hits.update(pc.add(pc.indices_nonzero(mask), offset).to_pylist())
+        offset += batch.num_rows
+    return hits
@@ -0,0 +1,20 @@
+"""
+Optional native build of the CSV scan
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+Cython compiles scan.py as-is (pure Python mode) into an extension module
+next to it, which main.py then imports in place of the .py file.
+"""
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    name="csv_search",
+    py_modules=["scan"],
+    ext_modules=cythonize(
+        ["scan.py"],
+        compiler_directives={"boundscheck": False, "wraparound": False, "language_level": 3},
+    ),
+)
@@ -0,0 +1,86 @@
+"""
+Unit tests for the per-file CSV scan
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the script directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scan
+from scan import scan_file
+
+BLANK_LINES = "id,name\n1,Alice\n2,bob\n\n3,BOB\n4,Carl\n5,Bob\n"
+QUOTED_NEWLINES = (
+    'id,name,note\n'
+    '1,Alice,"line one\nline two"\n'
+    '2,bob,x\n'
+    '\n'
+    '3,"B\nob",y\n'
+    '4,BOB,"a\n\nb"\n'
+    '5,Carl,z\n'
+    '\n'
+    '6,Bob,w\n'
+)
+
+
+class TestScanFile(unittest.TestCase):
+    """Test cases for scan_file with the pandas column scan"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        # find_hits takes its pandas branch when pyarrow is missing
+        patcher = patch.object(scan, "pa", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_csv(self, text: str) -> str:
+        path = os.path.join(self.directory.name, "data.csv")
+        with open(path, "w", newline="") as f:
+            f.write(text)
+        return path
+
+    def test_blank_lines(self):
+        """Test blank lines don't shift which rows are returned"""
+        results = scan_file(self.write_csv(BLANK_LINES), "name", "bob", 2)
+        self.assertEqual(results["id"].tolist(), [2, 3, 5])
+        self.assertEqual(results["name"].tolist(), ["bob", "BOB", "Bob"])
+        self.assertEqual(results["__source_file__"].unique().tolist(), ["data.csv"])
+
+    def test_quoted_newlines(self):
+        """Test newlines inside quoted values stay within their row"""
+        results = scan_file(self.write_csv(QUOTED_NEWLINES), "name", "bob", 3)
+        self.assertEqual(results["id"].tolist(), [2, 4, 6])
+        self.assertEqual(results["note"].tolist(), ["x", "a\n\nb", "w"])
+
+    def test_no_match(self):
+        """Test files without the column or without a match give None"""
+        path = self.write_csv(BLANK_LINES)
+        self.assertIsNone(scan_file(path, "name", "dave", 2))
+        self.assertIsNone(scan_file(path, "missing", "bob", 2))
+
+
+
+@unittest.skipIf(scan.pa is None, "pyarrow is not installed")
+class TestScanFileArrow(TestScanFile):
+    """The same cases with the pyarrow column scan"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_small_arrow_blocks(self):
+        """Test row offsets carry across record batches"""
+        rows = "".join(f"{i},{'bob' if i % 7 == 0 else 'x'}\n" + ("\n" if i % 5 == 0 else "") for i in range(1, 2000))
+        with patch.object(scan, "ARROW_BLOCK_SIZE", 1024):
+            results = scan_file(self.write_csv("id,name\n" + rows), "name", "bob", 100)
+        self.assertEqual(results["id"].tolist(), list(range(7, 2000, 7)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,42 +1,73 @@
 import requests
+import json
 import re
 import os
+from pathlib import Path
+from typing import Dict, Iterator
 
 OLLAMA_URL = "http://localhost:11434/api/generate"
 MODEL_NAME = "qwen3-coder"  # or any model you've pulled that supports code generation
 OUTPUT_DIR = OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_scripts")
 
-def call_ollama(prompt: str) -> str:
-    response = requests.post(OLLAMA_URL, json={
+OUTPUT_PATH = Path(OUTPUT_DIR)
+
+# Match headers like ```python # filename.py\n<code>\n```
+SCRIPT_PATTERN = re.compile(r"```python\s*#\s*(\S+\.py)\s*\n(.*?)```", re.DOTALL)
+
+def stream_ollama(prompt: str) -> Iterator[str]:
+    # Yield the response piece by piece as Ollama generates it
+    with requests.post(OLLAMA_URL, json={
         "model": MODEL_NAME,
         "prompt": prompt,
-        "stream": False
-    })
-    response.raise_for_status()
-    return response.json()["response"]
-
-def parse_scripts(text: str) -> dict:
-    # Match headers like ```python filename.py\n<code>\n```
-    pattern = r"```python\s*#\s*(\S+\.py)\s*\n(.*?)```"
-    matches = re.findall(pattern, text, re.DOTALL)
-    return {filename: code.strip() for filename, code in matches}
-
-def save_scripts(scripts: dict):
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+        "stream": True
+    }, stream=True) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line).get("response", "")
+
+def call_ollama(prompt: str) -> str:
+    return "".join(stream_ollama(prompt))
+
+def parse_scripts(text: str) -> Dict[str, str]:
+    # A block needs an opening and a closing fence
+    if text.count("```") < 2:
+        return {}
+    # finditer fills the dict directly, without findall's list of tuples
+    return {m.group(1): m.group(2).strip() for m in SCRIPT_PATTERN.finditer(text)}
+
+def save_script(filename: str, code: str) -> None:
+    # The name comes from model output; never write outside OUTPUT_DIR
+    if "/" in filename or "\\" in filename or ".." in filename:
+        print(f"⚠️ Skipped unsafe filename: {filename}")
+        return
+    path = OUTPUT_PATH / filename
+    path.write_text(code, encoding="utf-8")
+    print(f"✅ Saved: {path}")
+
+def save_scripts(scripts: Dict[str, str]) -> None:
+    OUTPUT_PATH.mkdir(exist_ok=True)
     for filename, code in scripts.items():
-        path = os.path.join(OUTPUT_DIR, filename)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(code)
-        print(f"✅ Saved: {path}")
+        save_script(filename, code)
 
-def main():
+def main() -> None:
     user_prompt = input("Enter your code generation prompt: ")
     print("🧠 Generating code from Ollama...")
-    response = call_ollama(user_prompt)
-    scripts = parse_scripts(response)
-    if scripts:
-        save_scripts(scripts)
-    else:
+    OUTPUT_PATH.mkdir(exist_ok=True)
+    # Save each script as soon as its closing fence arrives instead of
+    # waiting for the whole generation
+    response = ""
+    parsed_to = 0
+    saved = 0
+    for piece in stream_ollama(user_prompt):
+        response += piece
+        if "`" not in piece:
+            continue
+        for m in SCRIPT_PATTERN.finditer(response, parsed_to):
+            save_script(m.group(1), m.group(2).strip())
+            parsed_to = m.end()
+            saved += 1
+    if not saved:
         print("⚠️ No scripts found in the response.")
         print(response)
 